@@ -1,26 +1,36 @@
-from ShrutixMusic.core.bot import Shruti
-from ShrutixMusic.core.dir import dirr
-from ShrutixMusic.core.git import git
-from ShrutixMusic.core.userbot import Userbot
-from ShrutixMusic.misc import dbb, heroku
+from ShrutixMusic.core.profiler import profile
+
+with profile("core imports"):
+    from ShrutixMusic.core.bot import Shruti
+    from ShrutixMusic.core.dir import dirr
+    from ShrutixMusic.core.git import git
+    from ShrutixMusic.core.userbot import Userbot
+    from ShrutixMusic.misc import dbb, heroku
 
 from .logging import LOGGER
 
-dirr()
-git()
-dbb()
-heroku()
+with profile("dirr"):
+    dirr()
+with profile("git"):
+    git()
+with profile("dbb"):
+    dbb()
+with profile("heroku"):
+    heroku()
 
-nand = Shruti()
-userbot = Userbot()
+with profile("clients"):
+    nand = Shruti()
+    userbot = Userbot()
 
 
-from .platforms import *
+with profile("platforms import"):
+    from .platforms import *
 
-Apple = AppleAPI()
-Carbon = CarbonAPI()
-SoundCloud = SoundAPI()
-Spotify = SpotifyAPI()
-Resso = RessoAPI()
-Telegram = TeleAPI()
-YouTube = YouTubeAPI()
+with profile("platforms init"):
+    Apple = AppleAPI()
+    Carbon = CarbonAPI()
+    SoundCloud = SoundAPI()
+    Spotify = SpotifyAPI()
+    Resso = RessoAPI()
+    Telegram = TeleAPI()
+    YouTube = YouTubeAPI()
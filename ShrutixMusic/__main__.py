@@ -6,53 +6,127 @@ from pytgcalls.exceptions import NoActiveGroupCall
 
 import config
 from ShrutixMusic import LOGGER, nand, userbot
+from ShrutixMusic.core.profiler import profile, report
 from ShrutixMusic.core.call import Shruti
+from ShrutixMusic.core.exporter import exporter
+from ShrutixMusic.core.loader import lazy_plugin
+from ShrutixMusic.core.mongo import indexes
+from ShrutixMusic.core.monitor import monitor
+from ShrutixMusic.core.startup import Startup
+from ShrutixMusic.core.supervisor import supervisor
+from ShrutixMusic.core.writebehind import writer
 from ShrutixMusic.misc import sudo
-from ShrutixMusic.plugins import ALL_MODULES
-from ShrutixMusic.utils.database import get_banned_users, get_gbanned
+from ShrutixMusic.plugins import ALL_MODULES, LAZY_MODULES
+from ShrutixMusic.utils.database import (
+    get_banned_users,
+    iter_gbanned,
+    load_blacklists,
+    migrate_chat_settings,
+)
 from config import BANNED_USERS
 
 
 async def init():
-    if (
-        not config.STRING1
-        and not config.STRING2
-        and not config.STRING3
-        and not config.STRING4
-        and not config.STRING5
-    ):
+    if not config.STRING_SESSIONS:
         LOGGER(__name__).error("Assistant client variables not defined, exiting...")
         exit()
-    await sudo()
-    try:
-        users = await get_gbanned()
-        for user_id in users:
-            BANNED_USERS.add(user_id)
-        users = await get_banned_users()
-        for user_id in users:
-            BANNED_USERS.add(user_id)
-    except:
-        pass
-    await nand.start()
-    for all_module in ALL_MODULES:
-        importlib.import_module("ShrutixMusic.plugins" + all_module)
-    LOGGER("ShrutixMusic.plugins").info("Successfully Imported Modules...")
-    await userbot.start()
-    await Shruti.start()
-    try:
-        await Shruti.stream_call("https://te.legra.ph/file/29f784eb49d230ab62e9e.mp4")
-    except NoActiveGroupCall:
-        LOGGER("ShrutixMusic").error(
-            "Please turn on the videochat of your log group\channel.\n\nStopping Bot..."
-        )
-        exit()
-    except:
-        pass
-    await Shruti.decorators()
+    monitor.start()
+    startup = Startup()
+
+    @startup.step("sudoers")
+    async def load_sudoers():
+        await sudo()
+
+    # get_banned_users() reads the blocked set the blacklists step fills
+    @startup.step("banned users", "blacklists")
+    async def load_banned():
+        try:
+            async for user_id in iter_gbanned():
+                BANNED_USERS.add(user_id)
+            for user_id in await get_banned_users():
+                BANNED_USERS.add(user_id)
+        except:
+            pass
+
+    # The blacklist and block checks read these sets, a failed load stops startup
+    @startup.step("blacklists")
+    async def blacklists():
+        try:
+            await load_blacklists()
+        except Exception:
+            LOGGER(__name__).exception("Failed to load the blacklisted chats and blocked users.")
+            raise
+
+    @startup.step("indexes")
+    async def ensure_indexes():
+        created = await indexes.ensure()
+        LOGGER("ShrutixMusic").info(f"Ensured {created} Mongo indexes.")
+
+    @startup.step("chat settings", "indexes")
+    async def load_chat_settings():
+        migrated = await migrate_chat_settings()
+        if migrated:
+            LOGGER("ShrutixMusic").info(
+                f"Migrated settings of {migrated} chats into one document each."
+            )
+
+    @startup.step("bot")
+    async def start_bot():
+        await nand.start()
+
+    # Handlers must not read chat settings or ban lists before they are loaded
+    @startup.step("plugins", "bot", "chat settings", "banned users", "blacklists")
+    async def load_plugins():
+        for all_module in ALL_MODULES:
+            if all_module in LAZY_MODULES:
+                lazy_plugin(all_module, **LAZY_MODULES[all_module])
+                continue
+            with profile(f"import plugins{all_module}"):
+                importlib.import_module("ShrutixMusic.plugins" + all_module)
+        LOGGER("ShrutixMusic.plugins").info("Successfully Imported Modules...")
+
+    @startup.step("background jobs", "plugins")
+    async def start_jobs():
+        supervisor.start()
+
+    @startup.step("assistants")
+    async def start_assistants():
+        await userbot.start()
+
+    @startup.step("calls")
+    async def start_calls():
+        await Shruti.start()
+
+    @startup.step("stream check", "assistants", "calls")
+    async def stream_check():
+        try:
+            await Shruti.stream_call("https://te.legra.ph/file/29f784eb49d230ab62e9e.mp4")
+        except NoActiveGroupCall:
+            LOGGER("ShrutixMusic").error(
+                "Please turn on the videochat of your log group\channel.\n\nStopping Bot..."
+            )
+            exit()
+        except:
+            pass
+
+    @startup.step("call handlers", "calls")
+    async def call_handlers():
+        await Shruti.decorators()
+
+    @startup.step("metrics")
+    async def start_metrics():
+        if config.METRICS_PORT:
+            await exporter.start()
+
+    await startup.run()
+    report()
     LOGGER("ShrutixMusic").info(
     "\x53\x68\x72\x75\x74\x69\x78\x20\x4d\x75\x73\x69\x63\x20\x42\x6f\x74\x20\x53\x74\x61\x72\x74\x65\x64\x20\x53\x75\x63\x63\x65\x73\x73\x66\x75\x6c\x6c\x79\x2e\n\n\x44\x6f\x6e'\x74\x20\x66\x6f\x72\x67\x65\x74\x20\x74\x6f\x20\x76\x69\x73\x69\x74\x20\x40\x53\x68\x72\x75\x74\x69\x42\x6f\x74\x73"
 )
     await idle()
+    await exporter.stop()
+    await supervisor.stop()
+    await writer.flush(force=True)
     await nand.stop()
     await userbot.stop()
     LOGGER("ShrutixMusic").info("Stopping ShrutixMusic Music Bot...")
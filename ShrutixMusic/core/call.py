@@ -1,9 +1,9 @@
 import asyncio
 import os
-from datetime import datetime, timedelta
 from typing import Union
 
 from pyrogram import Client
+from pyrogram.errors import FloodWait
 from pyrogram.types import InlineKeyboardMarkup
 from pytgcalls import PyTgCalls, StreamType
 from pytgcalls.exceptions import (
@@ -18,19 +18,27 @@ from pytgcalls.types.stream import StreamAudioEnded
 
 import config
 from ShrutixMusic import LOGGER, YouTube, nand
+from ShrutixMusic.core.scheduler import scheduler
+from ShrutixMusic.core.supervisor import supervisor
+from ShrutixMusic.core.tracing import tracer
 from ShrutixMusic.misc import db
 from ShrutixMusic.utils.database import (
     add_active_chat,
     add_active_video_chat,
+    get_assistant_number,
     get_lang,
     get_loop,
     group_assistant,
+    is_active_chat,
     is_autoend,
     music_on,
+    record_assistant_flood,
+    record_assistant_ping,
     remove_active_chat,
     remove_active_video_chat,
     set_loop,
 )
+from ShrutixMusic.utils.admincache import watch_admin_cache
 from ShrutixMusic.utils.exceptions import AssistantErr
 from ShrutixMusic.utils.formatters import check_duration, seconds_to_min, speed_converter
 from ShrutixMusic.utils.inline.play import stream_markup
@@ -38,68 +46,41 @@ from ShrutixMusic.utils.stream.autoclear import auto_clean
 from ShrutixMusic.utils.thumbnails import get_thumb
 from strings import get_string
 
-autoend = {}
 counter = {}
 
+# Seconds between assistant ping samples, the latency part of the assignment load
+PING_INTERVAL = 30
+
 
 async def _clear_(chat_id):
     db[chat_id] = []
+    scheduler.cancel(("autoend", chat_id))
+    scheduler.cancel(("admincache", chat_id))
     await remove_active_video_chat(chat_id)
     await remove_active_chat(chat_id)
 
 
 class Call(PyTgCalls):
     def __init__(self):
-        self.userbot1 = Client(
-            name="ShrutiXAss1",
-            api_id=config.API_ID,
-            api_hash=config.API_HASH,
-            session_string=str(config.STRING1),
-        )
-        self.one = PyTgCalls(
-            self.userbot1,
-            cache_duration=100,
-        )
-        self.userbot2 = Client(
-            name="ShrutiXAss2",
-            api_id=config.API_ID,
-            api_hash=config.API_HASH,
-            session_string=str(config.STRING2),
-        )
-        self.two = PyTgCalls(
-            self.userbot2,
-            cache_duration=100,
-        )
-        self.userbot3 = Client(
-            name="ShrutiXAss3",
-            api_id=config.API_ID,
-            api_hash=config.API_HASH,
-            session_string=str(config.STRING3),
-        )
-        self.three = PyTgCalls(
-            self.userbot3,
-            cache_duration=100,
-        )
-        self.userbot4 = Client(
-            name="ShrutiXAss4",
-            api_id=config.API_ID,
-            api_hash=config.API_HASH,
-            session_string=str(config.STRING4),
-        )
-        self.four = PyTgCalls(
-            self.userbot4,
-            cache_duration=100,
-        )
-        self.userbot5 = Client(
-            name="ShrutiXAss5",
-            api_id=config.API_ID,
-            api_hash=config.API_HASH,
-            session_string=str(config.STRING5),
-        )
-        self.five = PyTgCalls(
-            self.userbot5,
-            cache_duration=100,
-        )
+        self.userbots = {}
+        self.pool = {}
+        for num, session in config.STRING_SESSIONS.items():
+            self.userbots[num] = Client(
+                name=f"ShrutiXAss{num}",
+                api_id=config.API_ID,
+                api_hash=config.API_HASH,
+                session_string=str(session),
+            )
+            self.pool[num] = PyTgCalls(
+                self.userbots[num],
+                cache_duration=100,
+            )
+
+    def __getitem__(self, num):
+        return self.pool[int(num)]
+
+    def __iter__(self):
+        return iter(self.pool.values())
 
     async def pause_stream(self, chat_id: int):
         assistant = await group_assistant(self, chat_id)
@@ -118,31 +99,11 @@ class Call(PyTgCalls):
             pass
 
     async def stop_stream_force(self, chat_id: int):
-        try:
-            if config.STRING1:
-                await self.one.leave_group_call(chat_id)
-        except:
-            pass
-        try:
-            if config.STRING2:
-                await self.two.leave_group_call(chat_id)
-        except:
-            pass
-        try:
-            if config.STRING3:
-                await self.three.leave_group_call(chat_id)
-        except:
-            pass
-        try:
-            if config.STRING4:
-                await self.four.leave_group_call(chat_id)
-        except:
-            pass
-        try:
-            if config.STRING5:
-                await self.five.leave_group_call(chat_id)
-        except:
-            pass
+        for assistant in self.pool.values():
+            try:
+                await assistant.leave_group_call(chat_id)
+            except:
+                pass
         try:
             await _clear_(chat_id)
         except:
@@ -280,6 +241,7 @@ class Call(PyTgCalls):
         await asyncio.sleep(0.2)
         await assistant.leave_group_call(config.LOGGER_ID)
 
+    @tracer.traced("join_call")
     async def join_call(
         self,
         chat_id: int,
@@ -319,15 +281,35 @@ class Call(PyTgCalls):
             raise AssistantErr(_["call_9"])
         except TelegramServerError:
             raise AssistantErr(_["call_10"])
+        except FloodWait as fw:
+            record_assistant_flood(await get_assistant_number(chat_id), fw.value)
+            raise
+        tracer.mark("first audio")
         await add_active_chat(chat_id)
         await music_on(chat_id)
         if video:
             await add_active_video_chat(chat_id)
+        watch_admin_cache(chat_id)
         if await is_autoend():
             counter[chat_id] = {}
             users = len(await assistant.get_participants(chat_id))
             if users == 1:
-                autoend[chat_id] = datetime.now() + timedelta(minutes=1)
+                scheduler.schedule(("autoend", chat_id), 60, self.auto_end, chat_id)
+
+    async def auto_end(self, chat_id: int):
+        if not await is_autoend() or not await is_active_chat(chat_id):
+            return
+        try:
+            await self.stop_stream(chat_id)
+        except:
+            return
+        try:
+            await nand.send_message(
+                chat_id,
+                "» ʙᴏᴛ ᴀᴜᴛᴏᴍᴀᴛɪᴄᴀʟʟʏ ʟᴇғᴛ ᴠɪᴅᴇᴏᴄʜᴀᴛ ʙᴇᴄᴀᴜsᴇ ɴᴏ ᴏɴᴇ ᴡᴀs ʟɪsᴛᴇɴɪɴɢ ᴏɴ ᴠɪᴅᴇᴏᴄʜᴀᴛ.",
+            )
+        except:
+            pass
 
     async def change_stream(self, client, chat_id):
         check = db.get(chat_id)
@@ -543,59 +525,40 @@ class Call(PyTgCalls):
 
     async def ping(self):
         pings = []
-        if config.STRING1:
-            pings.append(await self.one.ping)
-        if config.STRING2:
-            pings.append(await self.two.ping)
-        if config.STRING3:
-            pings.append(await self.three.ping)
-        if config.STRING4:
-            pings.append(await self.four.ping)
-        if config.STRING5:
-            pings.append(await self.five.ping)
+        for num, assistant in self.pool.items():
+            ping = await assistant.ping
+            record_assistant_ping(num, ping)
+            pings.append(ping)
         return str(round(sum(pings) / len(pings), 3))
 
     async def start(self):
         LOGGER(__name__).info("Starting PyTgCalls Client...\n")
-        if config.STRING1:
-            await self.one.start()
-        if config.STRING2:
-            await self.two.start()
-        if config.STRING3:
-            await self.three.start()
-        if config.STRING4:
-            await self.four.start()
-        if config.STRING5:
-            await self.five.start()
+        await asyncio.gather(*(assistant.start() for assistant in self.pool.values()))
 
     async def decorators(self):
-        @self.one.on_kicked()
-        @self.two.on_kicked()
-        @self.three.on_kicked()
-        @self.four.on_kicked()
-        @self.five.on_kicked()
-        @self.one.on_closed_voice_chat()
-        @self.two.on_closed_voice_chat()
-        @self.three.on_closed_voice_chat()
-        @self.four.on_closed_voice_chat()
-        @self.five.on_closed_voice_chat()
-        @self.one.on_left()
-        @self.two.on_left()
-        @self.three.on_left()
-        @self.four.on_left()
-        @self.five.on_left()
         async def stream_services_handler(_, chat_id: int):
             await self.stop_stream(chat_id)
 
-        @self.one.on_stream_end()
-        @self.two.on_stream_end()
-        @self.three.on_stream_end()
-        @self.four.on_stream_end()
-        @self.five.on_stream_end()
         async def stream_end_handler1(client, update: Update):
             if not isinstance(update, StreamAudioEnded):
                 return
             await self.change_stream(client, update.chat_id)
 
+        for assistant in self.pool.values():
+            assistant.on_kicked()(stream_services_handler)
+            assistant.on_closed_voice_chat()(stream_services_handler)
+            assistant.on_left()(stream_services_handler)
+            assistant.on_stream_end()(stream_end_handler1)
 
 Shruti = Call()
+
+
+@supervisor.job(PING_INTERVAL)
+async def sample_pings():
+    for num, assistant in Shruti.pool.items():
+        try:
+            ping = await asyncio.wait_for(assistant.ping, PING_INTERVAL / 2)
+            record_assistant_ping(num, ping)
+        except Exception:
+            # Not started yet or disconnected, keep the last sample
+            continue
@@ -0,0 +1,139 @@
+from aiohttp import web
+
+import config
+from ShrutixMusic import LOGGER
+from ShrutixMusic.core.metrics import metrics
+from ShrutixMusic.core.monitor import monitor
+from ShrutixMusic.core.supervisor import supervisor
+from ShrutixMusic.core.tracing import tracer
+from ShrutixMusic.core.userbot import assistants
+from ShrutixMusic.misc import db
+from ShrutixMusic.utils.database import (
+    active,
+    activevideo,
+    assistant_load,
+    assistantping,
+)
+
+PREFIX = "shrutix_"
+
+HELP = {
+    "cache_requests_total": "Cache lookups by cache and result.",
+    "floodwait_total": "FloodWaits hit per assistant.",
+    "mongo_command_failures_total": "Mongo commands that failed.",
+    "mongo_command_seconds": "Mongo command latency.",
+    "mongo_slow_commands_total": "Mongo commands slower than SLOW_QUERY_THRESHOLD.",
+    "writes_coalesced_total": "Queued upserts merged into an earlier one for the same document.",
+    "writes_flushed_total": "Upserts written by the write-behind batches.",
+}
+
+
+def _labels(labels) -> str:
+    if not labels:
+        return ""
+    pairs = ",".join(f'{key}="{str(value)}"' for key, value in labels)
+    return "{" + pairs + "}"
+
+
+class Exposition:
+    def __init__(self):
+        self.lines = []
+        self.described = set()
+
+    def describe(self, name: str, kind: str, text: str):
+        if name in self.described:
+            return
+        self.described.add(name)
+        self.lines.append(f"# HELP {PREFIX}{name} {text}")
+        self.lines.append(f"# TYPE {PREFIX}{name} {kind}")
+
+    def sample(self, name: str, value, labels=()):
+        self.lines.append(f"{PREFIX}{name}{_labels(labels)} {value}")
+
+    def histogram(self, name: str, histogram, labels=()):
+        seen = 0
+        for bound, hits in zip(histogram.bounds, histogram.buckets):
+            seen += hits
+            le = "+Inf" if bound == float("inf") else bound
+            self.sample(f"{name}_bucket", seen, (*labels, ("le", le)))
+        self.sample(f"{name}_sum", histogram.total, labels)
+        self.sample(f"{name}_count", histogram.count, labels)
+
+    def render(self) -> str:
+        return "\n".join(self.lines) + "\n"
+
+
+def collect() -> str:
+    out = Exposition()
+    out.describe("active_chats", "gauge", "Chats with an active voice chat stream.")
+    out.sample("active_chats", len(active))
+    out.describe("active_video_chats", "gauge", "Chats with an active video stream.")
+    out.sample("active_video_chats", len(activevideo))
+    out.describe("queued_tracks", "gauge", "Tracks waiting in all chat queues.")
+    out.sample("queued_tracks", sum(max(len(queue) - 1, 0) for queue in db.values()))
+    out.describe("downloads_in_flight", "gauge", "Downloads currently running.")
+    out.sample("downloads_in_flight", metrics.gauges.get("downloads", 0))
+
+    calls = active.per_assistant()
+    out.describe("assistant_calls", "gauge", "Active calls per assistant.")
+    out.describe("assistant_load", "gauge", "Load score used to pick an assistant.")
+    out.describe("assistant_ping_seconds", "gauge", "Last measured call ping per assistant.")
+    for num in assistants:
+        labels = (("assistant", num),)
+        out.sample("assistant_calls", calls.get(num, 0), labels)
+        out.sample("assistant_load", assistant_load(num), labels)
+        out.sample("assistant_ping_seconds", assistantping.get(num, 0) / 1000, labels)
+
+    lag = monitor.percentiles()
+    out.describe("loop_lag_seconds", "gauge", "Event loop lag percentiles over the recent window.")
+    for quantile in ("p50", "p95", "p99", "max"):
+        out.sample("loop_lag_seconds", lag[quantile] / 1000, (("quantile", quantile),))
+    out.describe("loop_stalls_total", "counter", "Event loop stalls longer than the slow callback threshold.")
+    out.sample("loop_stalls_total", monitor.stalls)
+
+    out.describe("job_runs_total", "counter", "Background job runs.")
+    out.describe("job_failures_total", "counter", "Background job runs that raised.")
+    for job in supervisor.jobs.values():
+        out.sample("job_runs_total", job.histogram.count, (("job", job.name),))
+        out.sample("job_failures_total", job.failures, (("job", job.name),))
+
+    with metrics.lock:
+        counters = sorted(metrics.counters.items())
+        histograms = sorted(metrics.histograms.items(), key=lambda item: item[0])
+        for (name, labels), value in counters:
+            out.describe(name, "counter", HELP.get(name, name))
+            out.sample(name, value, labels)
+        for (name, labels), histogram in histograms:
+            out.describe(name, "histogram", HELP.get(name, name))
+            out.histogram(name, histogram, labels)
+
+    out.describe("play_stage_seconds", "histogram", "Latency of each /play stage.")
+    for stage, histogram in sorted(tracer.histograms.items()):
+        out.histogram("play_stage_seconds", histogram, (("stage", stage),))
+    return out.render()
+
+
+class Exporter:
+    def __init__(self):
+        self.runner = None
+
+    async def handle(self, request):
+        return web.Response(text=collect(), content_type="text/plain", charset="utf-8")
+
+    async def start(self):
+        app = web.Application()
+        app.router.add_get("/metrics", self.handle)
+        self.runner = web.AppRunner(app, access_log=None)
+        await self.runner.setup()
+        site = web.TCPSite(self.runner, config.METRICS_HOST, config.METRICS_PORT)
+        await site.start()
+        LOGGER(__name__).info(
+            f"Serving metrics on http://{config.METRICS_HOST}:{config.METRICS_PORT}/metrics"
+        )
+
+    async def stop(self):
+        if self.runner:
+            await self.runner.cleanup()
+
+
+exporter = Exporter()
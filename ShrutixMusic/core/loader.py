@@ -0,0 +1,71 @@
+import asyncio
+import importlib
+
+from pyrogram import filters
+from pyrogram.handlers import CallbackQueryHandler, EditedMessageHandler, MessageHandler
+
+from ShrutixMusic import nand
+
+from ..logging import LOGGER
+
+LAZY_GROUP = -100
+
+# module -> future of the handlers it registered, set once the import is done
+loaded = {}
+
+
+def import_plugin(module: str) -> list:
+    captured = []
+    add_handler = nand.add_handler
+
+    def capture(handler, group: int = 0):
+        captured.append(handler)
+        return add_handler(handler, group)
+
+    nand.add_handler = capture
+    try:
+        importlib.import_module("ShrutixMusic.plugins" + module)
+    finally:
+        del nand.add_handler
+    return captured
+
+
+def lazy_plugin(module: str, commands: list = None, callbacks: list = None):
+    stubs = []
+
+    def loader(kind):
+        async def load(client, update):
+            future = loaded.get(module)
+            if future is None:
+                future = loaded[module] = asyncio.get_running_loop().create_future()
+                for stub in stubs:
+                    client.remove_handler(stub, LAZY_GROUP)
+                try:
+                    future.set_result(import_plugin(module))
+                except Exception:
+                    # Nothing awaits the future yet, put the stubs back so a later update retries
+                    future.cancel()
+                    del loaded[module]
+                    for stub in stubs:
+                        client.add_handler(stub, LAZY_GROUP)
+                    raise
+                LOGGER(__name__).info(f"Imported plugins{module} on first use.")
+            # Updates that reached a stub before it was removed go to the real handlers
+            handlers = await future
+            for handler in handlers:
+                if type(handler) is kind and await handler.check(client, update):
+                    return await handler.callback(client, update)
+
+        return load
+
+    if commands:
+        stubs.append(MessageHandler(loader(MessageHandler), filters.command(commands)))
+        stubs.append(
+            EditedMessageHandler(loader(EditedMessageHandler), filters.command(commands))
+        )
+    for pattern in callbacks or []:
+        stubs.append(
+            CallbackQueryHandler(loader(CallbackQueryHandler), filters.regex(pattern))
+        )
+    for stub in stubs:
+        nand.add_handler(stub, LAZY_GROUP)
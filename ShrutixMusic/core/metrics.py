@@ -0,0 +1,45 @@
+import threading
+from functools import wraps
+
+from .tracing import Histogram
+
+# Upper bounds (in seconds) of the latency histogram buckets
+BUCKETS = [0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 5, float("inf")]
+
+
+class Metrics:
+    def __init__(self):
+        # Mongo command events arrive from the driver's threads
+        self.lock = threading.Lock()
+        self.counters = {}
+        self.gauges = {}
+        self.histograms = {}
+
+    def inc(self, name: str, amount: float = 1, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        with self.lock:
+            self.counters[key] = self.counters.get(key, 0) + amount
+
+    def observe(self, name: str, seconds: float, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        with self.lock:
+            if key not in self.histograms:
+                self.histograms[key] = Histogram(BUCKETS)
+            self.histograms[key].observe(seconds)
+
+    def inflight(self, name: str):
+        def decorator(func):
+            @wraps(func)
+            async def wrapper(*args, **kwargs):
+                self.gauges[name] = self.gauges.get(name, 0) + 1
+                try:
+                    return await func(*args, **kwargs)
+                finally:
+                    self.gauges[name] -= 1
+
+            return wrapper
+
+        return decorator
+
+
+metrics = Metrics()
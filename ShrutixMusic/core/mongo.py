@@ -1,14 +1,93 @@
 from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import monitoring
+from pymongo.errors import OperationFailure
 
-from config import MONGO_DB_URI
+from config import MONGO_DB_URI, SLOW_QUERY_THRESHOLD, STORAGE, STORAGE_PATH
 
 from ..logging import LOGGER
+from .metrics import metrics
+from .profiler import profile
 
-LOGGER(__name__).info("Connecting to your Mongo Database...")
-try:
-    _mongo_async_ = AsyncIOMotorClient(MONGO_DB_URI)
+
+class CommandTimer(monitoring.CommandListener):
+    def __init__(self):
+        # request id -> (collection, filter keys) of commands still running
+        self.running = {}
+
+    def started(self, event):
+        command = event.command
+        query = command.get("filter") or command.get("q") or {}
+        if not isinstance(query, dict):
+            query = {}
+        self.running[event.request_id] = (
+            command.get(event.command_name),
+            sorted(query),
+        )
+
+    def _finished(self, event):
+        seconds = event.duration_micros / 1e6
+        collection, keys = self.running.pop(event.request_id, (None, []))
+        metrics.observe("mongo_command_seconds", seconds, command=event.command_name)
+        if seconds >= SLOW_QUERY_THRESHOLD:
+            metrics.inc("mongo_slow_commands_total", command=event.command_name)
+            LOGGER(__name__).warning(
+                f"Slow Mongo {event.command_name} on {collection} took {seconds * 1000:.0f}ms, filter keys : {keys}"
+            )
+
+    def succeeded(self, event):
+        self._finished(event)
+
+    def failed(self, event):
+        self._finished(event)
+        metrics.inc("mongo_command_failures_total", command=event.command_name)
+
+
+class IndexRegistry:
+    def __init__(self):
+        self.indexes = []
+
+    def declare(self, collection, key: str, unique: bool = False):
+        self.indexes.append((collection, key, unique))
+
+    async def ensure(self) -> int:
+        created = 0
+        for collection, key, unique in self.indexes:
+            try:
+                await collection.create_index(key, unique=unique)
+                created += 1
+            except OperationFailure as e:
+                if unique and e.code == 11000:
+                    LOGGER(__name__).warning(
+                        f"{collection.name} has duplicate {key} values, indexing it without unique."
+                    )
+                    await collection.create_index(key)
+                    created += 1
+                elif e.code in (85, 86):
+                    LOGGER(__name__).warning(
+                        f"{collection.name} already has a different index on {key}, keeping it : {e}"
+                    )
+                else:
+                    LOGGER(__name__).warning(
+                        f"Could not create the {key} index on {collection.name}, lookups on it will scan : {e}"
+                    )
+        return created
+
+
+indexes = IndexRegistry()
+
+
+if STORAGE == "sqlite":
+    from .storage import EmbeddedClient
+
+    _mongo_async_ = EmbeddedClient(STORAGE_PATH)
     mongodb = _mongo_async_.ShrutiBots
-    LOGGER(__name__).info("Connected to your Mongo Database.")
-except:
-    LOGGER(__name__).error("Failed to connect to your Mongo Database.")
-    exit()
+else:
+    LOGGER(__name__).info("Connecting to your Mongo Database...")
+    try:
+        with profile("mongo connect"):
+            _mongo_async_ = AsyncIOMotorClient(MONGO_DB_URI, event_listeners=[CommandTimer()])
+            mongodb = _mongo_async_.ShrutiBots
+        LOGGER(__name__).info("Connected to your Mongo Database.")
+    except:
+        LOGGER(__name__).error("Failed to connect to your Mongo Database.")
+        exit()
@@ -0,0 +1,90 @@
+import asyncio
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+
+import config
+
+from ..logging import LOGGER
+from .supervisor import supervisor
+
+
+class LoopMonitor:
+    def __init__(self, interval: float = 0.1, size: int = 3000):
+        self.interval = interval
+        self.threshold = config.SLOW_CALLBACK_THRESHOLD
+        self.samples = deque(maxlen=size)
+        self.heartbeat = time.monotonic()
+        self.stalls = 0
+        self.last_stall = None
+        self.loop_thread = None
+        self.task = None
+
+    def start(self):
+        if self.task:
+            return
+        self.loop_thread = threading.get_ident()
+        self.heartbeat = time.monotonic()
+        self.task = asyncio.create_task(self._sample())
+        threading.Thread(target=self._watchdog, name="LoopWatchdog", daemon=True).start()
+        LOGGER(__name__).info("Event Loop Monitor Started.")
+
+    async def _sample(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            start = loop.time()
+            self.heartbeat = time.monotonic()
+            await asyncio.sleep(self.interval)
+            self.samples.append(max(loop.time() - start - self.interval, 0))
+
+    def _watchdog(self):
+        reported = None
+        while True:
+            time.sleep(self.threshold / 2)
+            beat = self.heartbeat
+            blocked = time.monotonic() - beat - self.interval
+            if blocked < self.threshold or beat == reported:
+                continue
+            reported = beat
+            frame = sys._current_frames().get(self.loop_thread)
+            if frame is None:
+                continue
+            stack = "".join(traceback.format_stack(frame))
+            self.stalls += 1
+            self.last_stall = stack
+            LOGGER(__name__).warning(
+                f"Event loop blocked for more than {blocked:.2f}s, currently running:\n{stack}"
+            )
+
+    def percentiles(self) -> dict:
+        samples = sorted(self.samples)
+        if not samples:
+            return {"p50": 0.0, "p95": 0.0, "p99": 0.0, "max": 0.0}
+        pick = lambda pct: samples[min(int(len(samples) * pct / 100), len(samples) - 1)]
+        return {
+            "p50": pick(50) * 1000,
+            "p95": pick(95) * 1000,
+            "p99": pick(99) * 1000,
+            "max": samples[-1] * 1000,
+        }
+
+    def summary(self) -> str:
+        lag = self.percentiles()
+        return (
+            f"p50 {lag['p50']:.1f}ms | p95 {lag['p95']:.1f}ms | "
+            f"p99 {lag['p99']:.1f}ms | max {lag['max']:.1f}ms | stalls {self.stalls}"
+        )
+
+
+monitor = LoopMonitor()
+
+
+@supervisor.job(300)
+async def loop_lag_report():
+    lag = monitor.percentiles()
+    if lag["p99"] >= monitor.threshold * 1000:
+        LOGGER(__name__).warning(f"Event loop lag : {monitor.summary()}")
+    else:
+        LOGGER(__name__).info(f"Event loop lag : {monitor.summary()}")
@@ -0,0 +1,33 @@
+import time
+from contextlib import contextmanager
+
+import config
+
+from ..logging import LOGGER
+
+phases = []
+_begin_ = time.perf_counter()
+
+
+def record(name: str, seconds: float):
+    if config.STARTUP_PROFILE:
+        phases.append((name, seconds))
+
+
+@contextmanager
+def profile(name: str):
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record(name, time.perf_counter() - start)
+
+
+def report():
+    if not config.STARTUP_PROFILE:
+        return
+    total = time.perf_counter() - _begin_
+    lines = [f"Startup profile, {total:.2f}s total (steps may overlap):"]
+    for name, seconds in sorted(phases, key=lambda x: x[1], reverse=True):
+        lines.append(f"{seconds:8.3f}s {seconds / total * 100:5.1f}%  {name}")
+    LOGGER(__name__).info("\n".join(lines))
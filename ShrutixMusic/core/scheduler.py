@@ -0,0 +1,40 @@
+import asyncio
+
+from ..logging import LOGGER
+
+
+class Scheduler:
+    def __init__(self):
+        self.timers = {}
+        self.running = set()
+
+    def schedule(self, key, delay: float, callback, *args):
+        self.cancel(key)
+        loop = asyncio.get_running_loop()
+        self.timers[key] = loop.call_later(max(delay, 0), self._fire, key, callback, args)
+
+    def cancel(self, key) -> bool:
+        timer = self.timers.pop(key, None)
+        if not timer:
+            return False
+        timer.cancel()
+        return True
+
+    def pending(self, key) -> bool:
+        return key in self.timers
+
+    def _fire(self, key, callback, args):
+        self.timers.pop(key, None)
+        task = asyncio.create_task(callback(*args))
+        self.running.add(task)
+        task.add_done_callback(lambda t: self._done(key, t))
+
+    def _done(self, key, task: asyncio.Task):
+        self.running.discard(task)
+        if not task.cancelled() and task.exception():
+            LOGGER(__name__).error(
+                f"Timer {key} failed", exc_info=task.exception()
+            )
+
+
+scheduler = Scheduler()
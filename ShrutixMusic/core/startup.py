@@ -0,0 +1,41 @@
+import asyncio
+import time
+
+from ..logging import LOGGER
+from .profiler import record
+
+
+class Startup:
+    def __init__(self):
+        self.steps = {}
+        self.timings = {}
+
+    def step(self, name: str, *after: str):
+        def decorator(func):
+            self.steps[name] = (func, after)
+            return func
+
+        return decorator
+
+    async def run(self):
+        tasks = {}
+
+        async def runner(name):
+            func, after = self.steps[name]
+            if after:
+                await asyncio.gather(*(tasks[dep] for dep in after))
+            start = time.perf_counter()
+            await func()
+            self.timings[name] = time.perf_counter() - start
+            record(f"startup {name}", self.timings[name])
+            LOGGER(__name__).info(f"{name} done in {self.timings[name]:.2f}s")
+
+        for name, (_, after) in self.steps.items():
+            for dep in after:
+                if dep not in self.steps:
+                    raise ValueError(f"Startup step {name} depends on unknown step {dep}")
+        begin = time.perf_counter()
+        for name in self.steps:
+            tasks[name] = asyncio.create_task(runner(name))
+        await asyncio.gather(*tasks.values())
+        LOGGER(__name__).info(f"Startup finished in {time.perf_counter() - begin:.2f}s")
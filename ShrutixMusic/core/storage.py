@@ -0,0 +1,396 @@
+import asyncio
+import copy
+import json
+import os
+import sqlite3
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError, DuplicateKeyError, OperationFailure
+
+from ..logging import LOGGER
+
+# The embedded backend implements the part of Motor's collection API that
+# utils/database.py uses, so the helpers there work unchanged on either backend.
+
+
+def bulk_requests(collection, writes: list) -> list:
+    # writes are (filter, update, upsert) tuples, Motor wants pymongo's request objects
+    if getattr(collection, "plain_requests", False):
+        return list(writes)
+    return [UpdateOne(query, update, upsert=upsert) for query, update, upsert in writes]
+
+
+def _match(document: dict, query: dict) -> bool:
+    for key, expected in query.items():
+        value = document.get(key)
+        if isinstance(expected, dict) and any(op.startswith("$") for op in expected):
+            for op, operand in expected.items():
+                if op == "$gt" and not (value is not None and value > operand):
+                    return False
+                if op == "$gte" and not (value is not None and value >= operand):
+                    return False
+                if op == "$lt" and not (value is not None and value < operand):
+                    return False
+                if op == "$lte" and not (value is not None and value <= operand):
+                    return False
+                if op == "$ne" and value == operand:
+                    return False
+                if op == "$in" and value not in operand:
+                    return False
+                if op == "$exists" and (key in document) != operand:
+                    return False
+        elif value != expected:
+            return False
+    return True
+
+
+def _set(document: dict, key: str, value):
+    *parents, last = key.split(".")
+    for part in parents:
+        document = document.setdefault(part, {})
+    document[last] = copy.deepcopy(value)
+
+
+def _unset(document: dict, key: str):
+    *parents, last = key.split(".")
+    for part in parents:
+        document = document.get(part)
+        if not isinstance(document, dict):
+            return
+    document.pop(last, None)
+
+
+def _apply(document: dict, update: dict):
+    for key, value in update.get("$set", {}).items():
+        _set(document, key, value)
+    for key in update.get("$unset", {}):
+        _unset(document, key)
+    for key, value in update.get("$inc", {}).items():
+        document[key] = document.get(key, 0) + value
+
+
+def _project(document: dict, projection: dict) -> dict:
+    if not projection:
+        return copy.deepcopy(document)
+    included = [key for key, on in projection.items() if on and key != "_id"]
+    if included:
+        result = {key: copy.deepcopy(document[key]) for key in included if key in document}
+        if projection.get("_id", 1):
+            result["_id"] = document["_id"]
+        return result
+    return {
+        key: copy.deepcopy(value)
+        for key, value in document.items()
+        if projection.get(key, 1)
+    }
+
+
+class Result:
+    def __init__(self, **fields):
+        self.__dict__.update(fields)
+
+
+class EmbeddedCursor:
+    def __init__(self, documents: list):
+        self.documents = documents
+
+    def batch_size(self, size: int):
+        return self
+
+    def __aiter__(self):
+        return self._iterate()
+
+    async def _iterate(self):
+        for document in self.documents:
+            yield document
+
+    async def to_list(self, length=None):
+        return self.documents[:length]
+
+
+class EmbeddedCollection:
+    # bulk_write takes (filter, update, upsert) tuples, see bulk_requests
+    plain_requests = True
+
+    def __init__(self, database, name: str):
+        self.database = database
+        self.name = name
+        # field -> {value: set of _id}, built by create_index
+        self.indexes = {}
+        # Indexed fields no two documents may share a value of
+        self.unique = set()
+        self.reset(database._rows(name))
+
+    def reset(self, documents: list, changes: list = ()):
+        # Rebuilt from stored rows, then the changes not written to them yet
+        self.documents = {document["_id"]: document for document in documents}
+        for _, key, body in changes:
+            if body is None:
+                self.documents.pop(json.loads(key), None)
+            else:
+                document = json.loads(body)
+                self.documents[document["_id"]] = document
+        for field in self.indexes:
+            self.indexes[field] = self._build_index(field)
+
+    def _build_index(self, key: str, unique: bool = False) -> dict:
+        index = {}
+        for document in self.documents.values():
+            if key in document:
+                ids = index.setdefault(json.dumps(document[key]), set())
+                ids.add(document["_id"])
+                if unique and len(ids) > 1:
+                    raise OperationFailure(
+                        f"E11000 duplicate key error collection: {self.name} "
+                        f"index: {key}_1 dup key: {{ {key}: {json.dumps(document[key])} }}",
+                        11000,
+                    )
+        return index
+
+    def _index(self, document: dict):
+        for field, index in self.indexes.items():
+            if field in document:
+                index.setdefault(json.dumps(document[field]), set()).add(document["_id"])
+
+    def _unindex(self, document: dict):
+        for field, index in self.indexes.items():
+            if field in document:
+                ids = index.get(json.dumps(document[field]))
+                if ids:
+                    ids.discard(document["_id"])
+
+    def _candidates(self, query: dict):
+        for field, value in query.items():
+            if field in self.indexes and not isinstance(value, dict):
+                ids = self.indexes[field].get(json.dumps(value), ())
+                return [self.documents[_id] for _id in ids]
+        return self.documents.values()
+
+    def _matching(self, query: dict) -> list:
+        query = query or {}
+        return [doc for doc in self._candidates(query) if _match(doc, query)]
+
+    def _check_unique(self, document: dict):
+        # Like a sparse unique index, documents without the field never clash
+        for field in self.unique:
+            if field not in document:
+                continue
+            value = json.dumps(document[field])
+            if self.indexes[field].get(value, set()) - {document["_id"]}:
+                raise DuplicateKeyError(
+                    f"E11000 duplicate key error collection: {self.name} "
+                    f"index: {field}_1 dup key: {{ {field}: {value} }}",
+                    11000,
+                )
+
+    def _save(self, document: dict):
+        self._check_unique(document)
+        old = self.documents.get(document["_id"])
+        if old is not None:
+            self._unindex(old)
+        self.documents[document["_id"]] = document
+        self._index(document)
+        self.database.changes.append((self.name, json.dumps(document["_id"]), json.dumps(document)))
+
+    def _delete(self, document: dict):
+        self._unindex(document)
+        del self.documents[document["_id"]]
+        self.database.changes.append((self.name, json.dumps(document["_id"]), None))
+
+    def _update(self, query: dict, update: dict, upsert: bool) -> Result:
+        for document in self._matching(query):
+            # Changed on a copy so a duplicate key leaves the stored one untouched
+            document = copy.deepcopy(document)
+            _apply(document, update)
+            self._save(document)
+            return Result(matched_count=1, upserted_id=None)
+        if not upsert:
+            return Result(matched_count=0, upserted_id=None)
+        document = {
+            key: copy.deepcopy(value)
+            for key, value in query.items()
+            if not isinstance(value, dict)
+        }
+        document.setdefault("_id", uuid.uuid4().hex)
+        _apply(document, update)
+        self._save(document)
+        return Result(matched_count=0, upserted_id=document["_id"])
+
+    async def create_index(self, key: str, unique: bool = False):
+        self.indexes[key] = self._build_index(key, unique)
+        if unique:
+            self.unique.add(key)
+        return f"{key}_1"
+
+    async def find_one(self, query: dict = None, projection: dict = None):
+        for document in self._matching(query):
+            return _project(document, projection)
+        return None
+
+    def find(self, query: dict = None, projection: dict = None):
+        return EmbeddedCursor([_project(doc, projection) for doc in self._matching(query)])
+
+    async def count_documents(self, query: dict) -> int:
+        return len(self._matching(query))
+
+    async def insert_one(self, document: dict) -> Result:
+        document = copy.deepcopy(document)
+        document.setdefault("_id", uuid.uuid4().hex)
+        if document["_id"] in self.documents:
+            raise DuplicateKeyError(
+                f"E11000 duplicate key error collection: {self.name} index: _id_", 11000
+            )
+        self._save(document)
+        await self.database.commit()
+        return Result(inserted_id=document["_id"])
+
+    async def update_one(self, query: dict, update: dict, upsert: bool = False) -> Result:
+        result = self._update(query, update, upsert)
+        await self.database.commit()
+        return result
+
+    async def bulk_write(self, requests: list, ordered: bool = True) -> Result:
+        errors = []
+        for index, (query, update, upsert) in enumerate(requests):
+            try:
+                self._update(query, update, upsert)
+            except DuplicateKeyError as e:
+                errors.append({"index": index, "code": e.code, "errmsg": str(e)})
+                if ordered:
+                    break
+        await self.database.commit()
+        if errors:
+            raise BulkWriteError({"writeErrors": errors, "writeConcernErrors": []})
+        return Result(acknowledged=True)
+
+    async def delete_one(self, query: dict) -> Result:
+        for document in self._matching(query):
+            self._delete(document)
+            await self.database.commit()
+            return Result(deleted_count=1)
+        return Result(deleted_count=0)
+
+    async def delete_many(self, query: dict) -> Result:
+        documents = self._matching(query)
+        for document in documents:
+            self._delete(document)
+        await self.database.commit()
+        return Result(deleted_count=len(documents))
+
+
+class EmbeddedDatabase:
+    def __init__(self, path: str):
+        self.path = path
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS documents "
+            "(collection TEXT, id TEXT, body TEXT, PRIMARY KEY (collection, id))"
+        )
+        self.connection.commit()
+        self.collections = {}
+        # (collection, id, body or None to delete) not handed to the writer yet
+        self.changes = []
+        # Batches of changes the writer is committing
+        self.writing = []
+        # Task committing the changes made since the last batch started
+        self.batch = None
+        # One thread runs every transaction so they stay ordered and off the event loop
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="sqlite")
+
+    def __getattr__(self, name: str) -> EmbeddedCollection:
+        if name.startswith("__") or name in (
+            "path",
+            "connection",
+            "collections",
+            "changes",
+            "writing",
+            "batch",
+            "executor",
+        ):
+            raise AttributeError(name)
+        if name not in self.collections:
+            self.collections[name] = EmbeddedCollection(self, name)
+        return self.collections[name]
+
+    __getitem__ = __getattr__
+
+    def _rows(self, name: str) -> list:
+        return [
+            json.loads(body)
+            for body, in self.connection.execute(
+                "SELECT body FROM documents WHERE collection = ?", (name,)
+            )
+        ]
+
+    def _write(self, changes: list):
+        with self.connection:
+            for name, key, body in changes:
+                if body is None:
+                    self.connection.execute(
+                        "DELETE FROM documents WHERE collection = ? AND id = ?", (name, key)
+                    )
+                else:
+                    self.connection.execute(
+                        "INSERT OR REPLACE INTO documents (collection, id, body) VALUES (?, ?, ?)",
+                        (name, key, body),
+                    )
+
+    async def commit(self):
+        # Writes made before the batch task gets to run share its transaction
+        if self.batch is None:
+            self.batch = asyncio.ensure_future(self._commit())
+        await asyncio.shield(self.batch)
+
+    async def _commit(self):
+        await asyncio.sleep(0)
+        self.batch = None
+        changes, self.changes = self.changes, []
+        self.writing.append(changes)
+        loop = asyncio.get_running_loop()
+        try:
+            await loop.run_in_executor(self.executor, self._write, changes)
+        except Exception:
+            self.writing = [batch for batch in self.writing if batch is not changes]
+            self._reconcile({name for name, _, _ in changes})
+            raise
+        self.writing = [batch for batch in self.writing if batch is not changes]
+
+    def _reconcile(self, names: set):
+        # The transaction rolled back, so the collections it touched are rebuilt from
+        # the rows plus the changes still on their way to SQLite. Read here rather than
+        # in the writer thread so no batch can finish in between.
+        later = [change for batch in self.writing for change in batch] + self.changes
+        for name in names:
+            rows = self._rows(name)
+            self.collections[name].reset(rows, [change for change in later if change[0] == name])
+        LOGGER(__name__).error(f"Failed to write to {self.path}, reloaded {', '.join(sorted(names))}")
+
+    def _objects(self) -> int:
+        return self.connection.execute("SELECT COUNT(*) FROM documents").fetchone()[0]
+
+    async def command(self, name: str) -> dict:
+        size = os.path.getsize(self.path) if os.path.exists(self.path) else 0
+        objects = await asyncio.get_running_loop().run_in_executor(self.executor, self._objects)
+        return {
+            "dataSize": size,
+            "storageSize": size,
+            "collections": len(self.collections),
+            "objects": objects,
+        }
+
+
+class EmbeddedClient:
+    def __init__(self, path: str):
+        LOGGER(__name__).info(f"Using the embedded database at {path}")
+        self.database = EmbeddedDatabase(path)
+
+    def __getattr__(self, name: str) -> EmbeddedDatabase:
+        if name.startswith("__") or name == "database":
+            raise AttributeError(name)
+        return self.database
+
+    __getitem__ = __getattr__
@@ -0,0 +1,98 @@
+import asyncio
+import time
+
+from ..logging import LOGGER
+from .tracing import Histogram
+
+# Upper bounds (in seconds) of the run time histogram buckets
+BUCKETS = [0.001, 0.01, 0.05, 0.1, 0.5, 1, 5, 30, float("inf")]
+
+
+class Job:
+    def __init__(self, name: str, func, interval: float):
+        self.name = name
+        self.func = func
+        self.interval = interval
+        self.paused = False
+        self.failures = 0
+        self.overruns = 0
+        self.restarts = 0
+        self.last_run = None
+        self.last_error = None
+        self.histogram = Histogram(BUCKETS)
+
+    def observe(self, seconds: float):
+        self.histogram.observe(seconds)
+        self.last_run = time.time()
+        if seconds > self.interval:
+            self.overruns += 1
+            LOGGER(__name__).warning(
+                f"Background job {self.name} took {seconds:.2f}s, longer than its {self.interval}s interval."
+            )
+
+    async def run(self):
+        while not await asyncio.sleep(self.interval):
+            if self.paused:
+                continue
+            start = time.perf_counter()
+            try:
+                await self.func()
+            except Exception as e:
+                self.failures += 1
+                self.last_error = f"{type(e).__name__}: {e}"
+                LOGGER(__name__).exception(f"Background job {self.name} failed")
+            self.observe(time.perf_counter() - start)
+
+
+class Supervisor:
+    def __init__(self):
+        self.jobs = {}
+        self.tasks = {}
+
+    def job(self, interval: float):
+        def decorator(func):
+            self.jobs[func.__name__] = Job(func.__name__, func, interval)
+            return func
+
+        return decorator
+
+    def _spawn(self, job: Job):
+        task = asyncio.create_task(job.run())
+        task.add_done_callback(lambda t: self._restart(job, t))
+        self.tasks[job.name] = task
+
+    def _restart(self, job: Job, task: asyncio.Task):
+        if task.cancelled():
+            return
+        job.restarts += 1
+        LOGGER(__name__).error(
+            f"Background job {job.name} stopped unexpectedly ({task.exception()!r}), restarting it."
+        )
+        self._spawn(job)
+
+    def start(self):
+        for name, job in self.jobs.items():
+            if name not in self.tasks:
+                self._spawn(job)
+        LOGGER(__name__).info(f"Started {len(self.tasks)} Background Jobs.")
+
+    def pause(self, name: str) -> bool:
+        if name not in self.jobs:
+            return False
+        self.jobs[name].paused = True
+        return True
+
+    def resume(self, name: str) -> bool:
+        if name not in self.jobs:
+            return False
+        self.jobs[name].paused = False
+        return True
+
+    async def stop(self):
+        for task in self.tasks.values():
+            task.cancel()
+        await asyncio.gather(*self.tasks.values(), return_exceptions=True)
+        self.tasks.clear()
+
+
+supervisor = Supervisor()
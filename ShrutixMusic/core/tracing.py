@@ -0,0 +1,165 @@
+import asyncio
+import contextvars
+import json
+import time
+import uuid
+from collections import deque
+from contextlib import contextmanager
+from functools import wraps
+
+import config
+
+from ..logging import LOGGER
+
+# Upper bounds (in seconds) of the stage latency histogram buckets
+BUCKETS = [0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, float("inf")]
+
+current = contextvars.ContextVar("trace", default=None)
+
+
+class Histogram:
+    def __init__(self, bounds: list = BUCKETS):
+        self.bounds = bounds
+        self.count = 0
+        self.total = 0.0
+        self.slowest = 0.0
+        self.buckets = [0] * len(bounds)
+
+    def observe(self, seconds: float):
+        self.count += 1
+        self.total += seconds
+        self.slowest = max(self.slowest, seconds)
+        for i, bound in enumerate(self.bounds):
+            if seconds <= bound:
+                self.buckets[i] += 1
+                break
+
+    def percentile(self, pct: float) -> float:
+        if not self.count:
+            return 0.0
+        rank = self.count * pct / 100
+        seen = 0
+        for bound, hits in zip(self.bounds, self.buckets):
+            seen += hits
+            if seen >= rank:
+                return bound if bound != float("inf") else self.slowest
+        return self.slowest
+
+
+class Trace:
+    def __init__(self, name: str, **tags):
+        self.id = uuid.uuid4().hex[:12]
+        self.name = name
+        self.tags = tags
+        self.started = time.time()
+        self.start = time.perf_counter()
+        self.spans = []
+        self.marks = {}
+
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.start
+
+
+class Tracer:
+    def __init__(self, size: int = 100):
+        self.histograms = {}
+        self.recent = deque(maxlen=size)
+        # Trace lines waiting for the writer task to append them to TRACE_FILE
+        self.pending = []
+        self.writer = None
+
+    def histogram(self, stage: str) -> Histogram:
+        if stage not in self.histograms:
+            self.histograms[stage] = Histogram()
+        return self.histograms[stage]
+
+    @contextmanager
+    def trace(self, name: str, **tags):
+        trace = Trace(name, **tags)
+        token = current.set(trace)
+        status = "ok"
+        try:
+            yield trace
+        except BaseException as e:
+            status = type(e).__name__
+            raise
+        finally:
+            current.reset(token)
+            self.finish(trace, status)
+
+    @contextmanager
+    def span(self, stage: str):
+        trace = current.get()
+        if trace is None:
+            yield
+            return
+        start = time.perf_counter()
+        span = {"stage": stage, "at": round(start - trace.start, 4)}
+        try:
+            yield
+        except BaseException as e:
+            span["error"] = type(e).__name__
+            raise
+        finally:
+            seconds = time.perf_counter() - start
+            span["seconds"] = round(seconds, 4)
+            trace.spans.append(span)
+            self.histogram(stage).observe(seconds)
+
+    def traced(self, stage: str):
+        def decorator(func):
+            @wraps(func)
+            async def wrapper(*args, **kwargs):
+                with self.span(stage):
+                    return await func(*args, **kwargs)
+
+            return wrapper
+
+        return decorator
+
+    def mark(self, event: str):
+        trace = current.get()
+        if trace is None or event in trace.marks:
+            return
+        seconds = trace.elapsed()
+        trace.marks[event] = round(seconds, 4)
+        self.histogram(event).observe(seconds)
+
+    def finish(self, trace: Trace, status: str):
+        seconds = trace.elapsed()
+        self.histogram(f"{trace.name} total").observe(seconds)
+        record = {
+            "trace": trace.id,
+            "name": trace.name,
+            "time": trace.started,
+            "status": status,
+            "seconds": round(seconds, 4),
+            **trace.tags,
+            "marks": trace.marks,
+            "spans": trace.spans,
+        }
+        self.recent.append(record)
+        if config.TRACE_FILE:
+            self.pending.append(json.dumps(record, default=str))
+            if self.writer is None:
+                self.writer = asyncio.create_task(self.flush())
+
+    async def flush(self):
+        # The file is written in a thread, traces finished meanwhile go in the next batch
+        loop = asyncio.get_running_loop()
+        try:
+            while self.pending:
+                lines, self.pending = self.pending, []
+                await loop.run_in_executor(None, self.export, lines)
+        finally:
+            self.writer = None
+
+    def export(self, lines: list):
+        try:
+            with open(config.TRACE_FILE, "a") as f:
+                f.write("\n".join(lines) + "\n")
+        except OSError as e:
+            LOGGER(__name__).warning(f"Failed to write {len(lines)} traces: {e}")
+
+
+tracer = Tracer()
@@ -0,0 +1,113 @@
+import time
+
+from pymongo.errors import BulkWriteError
+
+from ..logging import LOGGER
+from .metrics import metrics
+from .storage import bulk_requests
+from .supervisor import supervisor
+
+# Seconds between flushes of the queued upserts
+FLUSH_INTERVAL = 0.3
+
+# Flushes a write may fail on its own (duplicate key, validation) before it is dropped
+MAX_ATTEMPTS = 3
+
+# Upper bound in seconds on the wait after a whole batch fails (server down, timeout)
+MAX_BACKOFF = 60
+
+
+class WriteBehind:
+    def __init__(self):
+        # collection name -> (collection, {query key: (query, fields)})
+        self.pending = {}
+        # (collection name, query key) -> failed flushes of that write
+        self.attempts = {}
+        # collection name -> (consecutive failed batches, monotonic time of next try)
+        self.backoff = {}
+
+    def upsert(self, collection, query: dict, fields: dict = None):
+        _, writes = self.pending.setdefault(collection.name, (collection, {}))
+        key = tuple(sorted(query.items()))
+        if key in writes:
+            writes[key][1].update(fields or {})
+            metrics.inc("writes_coalesced_total", collection=collection.name)
+        else:
+            writes[key] = (query, dict(fields or {}))
+
+    def _requeue(self, collection, writes: dict):
+        if not writes:
+            return
+        _, pending = self.pending.setdefault(collection.name, (collection, {}))
+        for key, (query, fields) in writes.items():
+            if key in pending:
+                # Newer values queued while the batch was in flight win
+                fields = {**fields, **pending[key][1]}
+            pending[key] = (query, fields)
+
+    def _failed(self, collection, writes: dict, errors: list):
+        name = collection.name
+        keys = list(writes)
+        retry = {}
+        for error in errors:
+            key = keys[error["index"]]
+            attempts = self.attempts.get((name, key), 0) + 1
+            if attempts < MAX_ATTEMPTS:
+                self.attempts[(name, key)] = attempts
+                retry[key] = writes[key]
+                continue
+            self.attempts.pop((name, key), None)
+            metrics.inc("writes_dropped_total", collection=name)
+            LOGGER(__name__).error(
+                f"Dropping write to {name} for {writes[key][0]} after "
+                f"{attempts} attempts : {error.get('errmsg')}"
+            )
+        for key in keys:
+            if key not in retry:
+                self.attempts.pop((name, key), None)
+        self._requeue(collection, retry)
+        return len(keys) - len(errors)
+
+    async def flush(self, force: bool = False):
+        pending, self.pending = self.pending, {}
+        now = time.monotonic()
+        for name, (collection, writes) in pending.items():
+            failures, retry_at = self.backoff.get(name, (0, 0))
+            if now < retry_at and not force:
+                self._requeue(collection, writes)
+                continue
+            requests = bulk_requests(
+                collection,
+                [
+                    (query, {"$set": {**query, **fields}}, True)
+                    for query, fields in writes.values()
+                ],
+            )
+            try:
+                await collection.bulk_write(requests, ordered=False)
+                flushed = len(requests)
+                for key in writes:
+                    self.attempts.pop((name, key), None)
+            except BulkWriteError as e:
+                # Only the writes listed here failed, the rest of the batch is stored
+                flushed = self._failed(collection, writes, e.details["writeErrors"])
+            except Exception as e:
+                failures += 1
+                delay = min(FLUSH_INTERVAL * 2**failures, MAX_BACKOFF)
+                self.backoff[name] = (failures, time.monotonic() + delay)
+                LOGGER(__name__).warning(
+                    f"Failed to flush {len(requests)} writes to {name}, "
+                    f"retrying in {delay:.1f}s : {e}"
+                )
+                self._requeue(collection, writes)
+                continue
+            self.backoff.pop(name, None)
+            metrics.inc("writes_flushed_total", flushed, collection=name)
+
+
+writer = WriteBehind()
+
+
+@supervisor.job(FLUSH_INTERVAL)
+async def flush_writes():
+    await writer.flush()
@@ -2,6 +2,8 @@ from os import path
 
 from yt_dlp import YoutubeDL
 
+from ShrutixMusic.core.metrics import metrics
+from ShrutixMusic.core.tracing import tracer
 from ShrutixMusic.utils.formatters import seconds_to_min
 
 
@@ -21,6 +23,8 @@ class SoundAPI:
         else:
             return False
 
+    @tracer.traced("download")
+    @metrics.inflight("downloads")
     async def download(self, url):
         d = YoutubeDL(self.opts)
         try:
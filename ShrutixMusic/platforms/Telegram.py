@@ -7,6 +7,8 @@ from pyrogram.types import InlineKeyboardButton, InlineKeyboardMarkup, Voice
 
 import config
 from ShrutixMusic import nand
+from ShrutixMusic.core.metrics import metrics
+from ShrutixMusic.core.tracing import tracer
 from ShrutixMusic.utils.formatters import (
     check_duration,
     convert_bytes,
@@ -91,6 +93,8 @@ class TeleAPI:
             file_name = os.path.join(os.path.realpath("downloads"), file_name)
         return file_name
 
+    @tracer.traced("download")
+    @metrics.inflight("downloads")
     async def download(self, _, message, mystic, fname):
         lower = [0, 8, 17, 38, 64, 77, 96]
         higher = [5, 10, 20, 40, 66, 80, 99]
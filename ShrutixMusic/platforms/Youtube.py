@@ -9,6 +9,8 @@ from py_yt import VideosSearch
 from ShrutixMusic.utils.formatters import time_to_seconds
 import aiohttp
 from ShrutixMusic import LOGGER
+from ShrutixMusic.core.metrics import metrics
+from ShrutixMusic.core.tracing import tracer
 from typing import Union
 
 YOUR_API_URL = None
@@ -59,7 +61,9 @@ async def download_song(link: str) -> str:
     file_path = os.path.join(DOWNLOAD_DIR, f"{video_id}.mp3")
 
     if os.path.exists(file_path):
+        metrics.inc("cache_requests_total", cache="downloads", result="hit")
         return file_path
+    metrics.inc("cache_requests_total", cache="downloads", result="miss")
 
     try:
         async with aiohttp.ClientSession() as session:
@@ -116,7 +120,9 @@ async def download_video(link: str) -> str:
     file_path = os.path.join(DOWNLOAD_DIR, f"{video_id}.mp4")
 
     if os.path.exists(file_path):
+        metrics.inc("cache_requests_total", cache="downloads", result="hit")
         return file_path
+    metrics.inc("cache_requests_total", cache="downloads", result="miss")
 
     try:
         async with aiohttp.ClientSession() as session:
@@ -267,6 +273,7 @@ class YouTubeAPI:
             result = []
         return result
 
+    @tracer.traced("search")
     async def track(self, link: str, videoid: Union[bool, str] = None):
         if videoid:
             link = self.base + link
@@ -328,6 +335,8 @@ class YouTubeAPI:
         thumbnail = result[query_type]["thumbnails"][0]["url"].split("?")[0]
         return title, duration_min, thumbnail, vidid
 
+    @tracer.traced("download")
+    @metrics.inflight("downloads")
     async def download(
         self,
         link: str,
@@ -16,4 +16,14 @@ def __list_all_modules():
 
 
 ALL_MODULES = sorted(__list_all_modules())
-__all__ = ALL_MODULES + ["ALL_MODULES"]
+
+# Rarely used plugins, imported the first time one of their triggers is seen
+LAZY_MODULES = {
+    ".misc.broadcast": {"commands": ["broadcast"]},
+    ".sudo.gban": {
+        "commands": ["gban", "globalban", "ungban", "gbannedusers", "gbanlist"]
+    },
+    ".tools.dev": {"commands": ["eval", "sh"]},
+    ".tools.speedtest": {"commands": ["speedtest", "spt"]},
+}
+__all__ = ALL_MODULES + ["ALL_MODULES", "LAZY_MODULES"]
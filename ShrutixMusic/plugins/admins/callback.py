@@ -6,6 +6,7 @@ from pyrogram.types import InlineKeyboardMarkup, InlineKeyboardButton, InputMedi
 
 from ShrutixMusic import YouTube, nand
 from ShrutixMusic.core.call import Shruti
+from ShrutixMusic.core.supervisor import supervisor
 from ShrutixMusic.misc import SUDOERS, db
 from ShrutixMusic.utils.database import (
     get_active_chats,
@@ -32,12 +33,12 @@ from config import (
     TELEGRAM_VIDEO_URL,
     adminlist,
     confirmer,
+    upvoters,
     votemode,
 )
 from strings import get_string
 
 checker = {}
-upvoters = {}
 
 VIDEO_LINKS = [
     "https://envs.sh/kJd.mp4",
@@ -394,51 +395,48 @@ async def del_back_playlist(client, CallbackQuery, _):
             await CallbackQuery.edit_message_text(txt, reply_markup=close_markup(_))
 
 
+@supervisor.job(7)
 async def markup_timer():
-    while not await asyncio.sleep(7):
-        active_chats = await get_active_chats()
-        for chat_id in active_chats:
+    active_chats = await get_active_chats()
+    for chat_id in active_chats:
+        try:
+            if not await is_music_playing(chat_id):
+                continue
+            playing = db.get(chat_id)
+            if not playing:
+                continue
+            duration_seconds = int(playing[0]["seconds"])
+            if duration_seconds == 0:
+                continue
             try:
-                if not await is_music_playing(chat_id):
-                    continue
-                playing = db.get(chat_id)
-                if not playing:
-                    continue
-                duration_seconds = int(playing[0]["seconds"])
-                if duration_seconds == 0:
-                    continue
-                try:
-                    mystic = playing[0]["mystic"]
-                except:
-                    continue
-                try:
-                    check = checker[chat_id][mystic.id]
-                    if check is False:
-                        continue
-                except:
-                    pass
-                try:
-                    language = await get_lang(chat_id)
-                    _ = get_string(language)
-                except:
-                    _ = get_string("en")
-                try:
-                    buttons = stream_markup_timer(
-                        _,
-                        chat_id,
-                        seconds_to_min(playing[0]["played"]),
-                        playing[0]["dur"],
-                    )
-                    await mystic.edit_reply_markup(
-                        reply_markup=InlineKeyboardMarkup(buttons)
-                    )
-                except:
+                mystic = playing[0]["mystic"]
+            except:
+                continue
+            try:
+                check = checker[chat_id][mystic.id]
+                if check is False:
                     continue
+            except:
+                pass
+            try:
+                language = await get_lang(chat_id)
+                _ = get_string(language)
+            except:
+                _ = get_string("en")
+            try:
+                buttons = stream_markup_timer(
+                    _,
+                    chat_id,
+                    seconds_to_min(playing[0]["played"]),
+                    playing[0]["dur"],
+                )
+                await mystic.edit_reply_markup(
+                    reply_markup=InlineKeyboardMarkup(buttons)
+                )
             except:
                 continue
-
-
-asyncio.create_task(markup_timer())
+        except:
+            continue
 
 
 
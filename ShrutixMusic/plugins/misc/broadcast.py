@@ -1,21 +1,17 @@
 import asyncio
 
 from pyrogram import filters
-from pyrogram.enums import ChatMembersFilter
 from pyrogram.errors import FloodWait
 
 from ShrutixMusic import nand
 from ShrutixMusic.misc import SUDOERS
 from ShrutixMusic.utils.database import (
-    get_active_chats,
-    get_authuser_names,
     get_client,
-    get_served_chats,
-    get_served_users,
+    iter_served_chats,
+    iter_served_users,
+    record_assistant_flood,
 )
 from ShrutixMusic.utils.decorators.language import language
-from ShrutixMusic.utils.formatters import alpha_to_int
-from config import adminlist
 
 IS_BROADCASTING = False
 
@@ -52,10 +48,8 @@ async def braodcast_message(client, message, _):
     if "-nobot" not in message.text:
         sent = 0
         pin = 0
-        chats = []
-        schats = await get_served_chats()
-        for chat in schats:
-            chats.append(int(chat["chat_id"]))
+        # Only the ids are kept, a cursor left open across hours of sends would time out
+        chats = [int(chat_id) async for chat_id in iter_served_chats()]
         for i in chats:
             try:
                 m = (
@@ -91,10 +85,7 @@ async def braodcast_message(client, message, _):
 
     if "-user" in message.text:
         susr = 0
-        served_users = []
-        susers = await get_served_users()
-        for user in susers:
-            served_users.append(int(user["user_id"]))
+        served_users = [int(user_id) async for user_id in iter_served_users()]
         
         for target in special_targets:
             served_users.append(target)
@@ -139,6 +130,7 @@ async def braodcast_message(client, message, _):
                     await asyncio.sleep(3)
                 except FloodWait as fw:
                     flood_time = int(fw.value)
+                    record_assistant_flood(num, flood_time)
                     if flood_time > 200:
                         continue
                     await asyncio.sleep(flood_time)
@@ -150,26 +142,3 @@ async def braodcast_message(client, message, _):
         except:
             pass
     IS_BROADCASTING = False
-
-
-async def auto_clean():
-    while not await asyncio.sleep(10):
-        try:
-            served_chats = await get_active_chats()
-            for chat_id in served_chats:
-                if chat_id not in adminlist:
-                    adminlist[chat_id] = []
-                    async for user in nand.get_chat_members(
-                        chat_id, filter=ChatMembersFilter.ADMINISTRATORS
-                    ):
-                        if user.privileges.can_manage_video_chats:
-                            adminlist[chat_id].append(user.user.id)
-                    authusers = await get_authuser_names(chat_id)
-                    for user in authusers:
-                        user_id = await alpha_to_int(user)
-                        adminlist[chat_id].append(user_id)
-        except:
-            continue
-
-
-asyncio.create_task(auto_clean())
\ No newline at end of file
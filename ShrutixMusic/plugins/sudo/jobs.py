@@ -0,0 +1,36 @@
+from pyrogram import filters
+from pyrogram.types import Message
+
+from ShrutixMusic import nand
+from ShrutixMusic.core.supervisor import supervisor
+from ShrutixMusic.misc import SUDOERS
+
+
+@nand.on_message(filters.command(["jobs"]) & SUDOERS)
+async def background_jobs(_, message: Message):
+    usage = "<b>ᴇxᴀᴍᴘʟᴇ :</b>\n\n/jobs\n/jobs [ᴘᴀᴜsᴇ | ʀᴇsᴜᴍᴇ] [ᴊᴏʙ ɴᴀᴍᴇ]"
+    if len(message.command) == 1:
+        text = "<b>ʙᴀᴄᴋɢʀᴏᴜɴᴅ ᴊᴏʙs :</b>\n"
+        for job in supervisor.jobs.values():
+            state = "ᴘᴀᴜsᴇᴅ" if job.paused else "ʀᴜɴɴɪɴɢ"
+            text += (
+                f"\n<b>{job.name}</b> [{state}] ᴇᴠᴇʀʏ {job.interval}s\n"
+                f"ʀᴜɴs : {job.histogram.count} | ғᴀɪʟᴇᴅ : {job.failures} | ᴏᴠᴇʀʀᴜɴs : {job.overruns} | ʀᴇsᴛᴀʀᴛs : {job.restarts}\n"
+                f"ᴘ50 : {job.histogram.percentile(50) * 1000:.0f}ᴍs | ᴘ95 : {job.histogram.percentile(95) * 1000:.0f}ᴍs | ᴍᴀx : {job.histogram.slowest * 1000:.0f}ᴍs\n"
+            )
+            if job.last_error:
+                text += f"ʟᴀsᴛ ᴇʀʀᴏʀ : <code>{job.last_error[:200]}</code>\n"
+        return await message.reply_text(text)
+    if len(message.command) != 3:
+        return await message.reply_text(usage)
+    state = message.command[1].lower()
+    name = message.command[2]
+    if state == "pause":
+        done = supervisor.pause(name)
+    elif state == "resume":
+        done = supervisor.resume(name)
+    else:
+        return await message.reply_text(usage)
+    if not done:
+        return await message.reply_text(f"» ɴᴏ ʙᴀᴄᴋɢʀᴏᴜɴᴅ ᴊᴏʙ ɴᴀᴍᴇᴅ <code>{name}</code>.")
+    await message.reply_text(f"» <code>{name}</code> {state}d.")
@@ -1,7 +1,11 @@
 import asyncio
+import cProfile
+import io
 import os
+import pstats
 import shutil
 import socket
+import tracemalloc
 from datetime import datetime
 
 import urllib3
@@ -11,6 +15,7 @@ from pyrogram import filters
 
 import config
 from ShrutixMusic import nand
+from ShrutixMusic.core.writebehind import writer
 from ShrutixMusic.misc import HAPP, SUDOERS, XCB
 from ShrutixMusic.utils.database import (
     get_active_chats,
@@ -22,6 +27,8 @@ from ShrutixMusic.utils.pastebin import ShrutiBin
 
 urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 
+profiling = asyncio.Lock()
+
 
 async def is_heroku():
     return "heroku" in socket.getfqdn()
@@ -36,6 +43,62 @@ async def log_(client, message, _):
         await message.reply_text(_["server_1"])
 
 
+@nand.on_message(filters.command(["profile"]) & SUDOERS)
+async def profile_(client, message):
+    usage = "<b>ᴇxᴀᴍᴘʟᴇ :</b>\n\n/profile [ᴄᴘᴜ | ᴍᴇᴍ | ᴀʟʟ] [sᴇᴄᴏɴᴅs]"
+    mode = message.command[1].lower() if len(message.command) > 1 else "cpu"
+    if mode not in ["cpu", "mem", "all"]:
+        return await message.reply_text(usage)
+    try:
+        seconds = int(message.command[2]) if len(message.command) > 2 else 30
+    except ValueError:
+        return await message.reply_text(usage)
+    seconds = min(max(seconds, 1), 300)
+    if profiling.locked():
+        return await message.reply_text("» ᴀ ᴘʀᴏғɪʟᴇ ɪs ᴀʟʀᴇᴀᴅʏ ʀᴜɴɴɪɴɢ, ᴡᴀɪᴛ ғᴏʀ ɪᴛ ᴛᴏ ғɪɴɪsʜ.")
+    async with profiling:
+        response = await message.reply_text(f"» ᴘʀᴏғɪʟɪɴɢ ғᴏʀ {seconds} sᴇᴄᴏɴᴅs...")
+        profiler = cProfile.Profile() if mode != "mem" else None
+        tracing = mode != "cpu" and not tracemalloc.is_tracing()
+        if tracing:
+            tracemalloc.start(25)
+        if mode != "cpu":
+            before = tracemalloc.take_snapshot()
+        if profiler:
+            profiler.enable()
+        try:
+            await asyncio.sleep(seconds)
+        finally:
+            if profiler:
+                profiler.disable()
+            if mode != "cpu":
+                after = tracemalloc.take_snapshot()
+                current, peak = tracemalloc.get_traced_memory()
+            if tracing:
+                tracemalloc.stop()
+        report = io.StringIO()
+        if profiler:
+            report.write(f"cProfile, {seconds}s, sorted by cumulative time\n\n")
+            stats = pstats.Stats(profiler, stream=report)
+            stats.sort_stats("cumulative").print_stats(60)
+            report.write("\nSorted by internal time\n\n")
+            stats.sort_stats("tottime").print_stats(30)
+        if mode != "cpu":
+            report.write(
+                f"\ntracemalloc, {seconds}s, traced {current / 1024 / 1024:.1f} MiB, peak {peak / 1024 / 1024:.1f} MiB\n"
+            )
+            report.write("\nTop allocations\n\n")
+            for stat in after.statistics("lineno")[:30]:
+                report.write(f"{stat}\n")
+            report.write("\nGrowth while profiling\n\n")
+            for stat in after.compare_to(before, "lineno")[:30]:
+                report.write(f"{stat}\n")
+        document = io.BytesIO(report.getvalue().encode())
+        document.name = f"profile_{mode}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.txt"
+        await message.reply_document(document=document)
+        await response.delete()
+
+
 @nand.on_message(filters.command(["update", "gitpull"]) & SUDOERS)
 @language
 async def update_(client, message, _):
@@ -106,6 +169,7 @@ async def update_(client, message, _):
             )
     else:
         os.system("pip3 install -r requirements.txt")
+        await writer.flush(force=True)
         os.system(f"kill -9 {os.getpid()} && bash start")
         exit()
 
@@ -134,4 +198,5 @@ async def restart_(_, message):
     await response.edit_text(
         "» ʀᴇsᴛᴀʀᴛ ᴘʀᴏᴄᴇss sᴛᴀʀᴛᴇᴅ, ᴘʟᴇᴀsᴇ ᴡᴀɪᴛ ғᴏʀ ғᴇᴡ sᴇᴄᴏɴᴅs ᴜɴᴛɪʟ ᴛʜᴇ ʙᴏᴛ sᴛᴀʀᴛs..."
     )
+    await writer.flush(force=True)
     os.system(f"kill -9 {os.getpid()} && bash start")
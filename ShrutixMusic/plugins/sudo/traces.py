@@ -0,0 +1,34 @@
+import json
+from io import BytesIO
+
+from pyrogram import filters
+from pyrogram.types import Message
+
+from ShrutixMusic import nand
+from ShrutixMusic.core.tracing import tracer
+from ShrutixMusic.misc import SUDOERS
+
+
+@nand.on_message(filters.command(["traces"]) & SUDOERS)
+async def play_traces(_, message: Message):
+    if not tracer.histograms:
+        return await message.reply_text("» ɴᴏ ᴘʟᴀʏ ᴛʀᴀᴄᴇs ʀᴇᴄᴏʀᴅᴇᴅ ʏᴇᴛ.")
+    if len(message.command) > 1 and message.command[1].lower() == "export":
+        data = BytesIO(
+            "".join(json.dumps(record, default=str) + "\n" for record in tracer.recent).encode()
+        )
+        data.name = "traces.jsonl"
+        return await message.reply_document(
+            document=data,
+            caption=f"» ʟᴀsᴛ {len(tracer.recent)} ᴘʟᴀʏ ᴛʀᴀᴄᴇs.",
+        )
+    text = "<b>ᴘʟᴀʏ ʟᴀᴛᴇɴᴄʏ :</b>\n"
+    stages = sorted(
+        tracer.histograms.items(), key=lambda item: item[1].percentile(95), reverse=True
+    )
+    for stage, histogram in stages:
+        text += (
+            f"\n<b>{stage}</b> [{histogram.count}]\n"
+            f"ᴘ50 : {histogram.percentile(50) * 1000:.0f}ᴍs | ᴘ95 : {histogram.percentile(95) * 1000:.0f}ᴍs | ᴍᴀx : {histogram.slowest * 1000:.0f}ᴍs\n"
+        )
+    await message.reply_text(text)
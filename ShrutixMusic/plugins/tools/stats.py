@@ -10,12 +10,18 @@ from pytgcalls.__version__ import __version__ as pytgver
 
 import config
 from ShrutixMusic import nand
+from ShrutixMusic.core.monitor import monitor
 from ShrutixMusic.core.userbot import assistants
 from ShrutixMusic.misc import SUDOERS, mongodb
 from ShrutixMusic.plugins import ALL_MODULES
-from ShrutixMusic.utils.database import get_served_chats, get_served_users, get_sudoers
+from ShrutixMusic.utils.database import (
+    get_served_chats_count,
+    get_served_users_count,
+    get_sudoers,
+)
 from ShrutixMusic.utils.decorators.language import language, languageCB
 from ShrutixMusic.utils.inline.stats import back_stats_buttons, stats_buttons
+from ShrutixMusic.utils.sys import latest_stats, trend
 from config import BANNED_USERS
 
 
@@ -50,8 +56,8 @@ async def overall_stats(client, CallbackQuery, _):
     except:
         pass
     await CallbackQuery.edit_message_text(_["gstats_1"].format(nand.mention))
-    served_chats = len(await get_served_chats())
-    served_users = len(await get_served_users())
+    served_chats = await get_served_chats_count()
+    served_users = await get_served_users_count()
     text = _["gstats_3"].format(
         nand.mention,
         len(assistants),
@@ -85,7 +91,8 @@ async def bot_stats(client, CallbackQuery, _):
     await CallbackQuery.edit_message_text(_["gstats_1"].format(nand.mention))
     p_core = psutil.cpu_count(logical=False)
     t_core = psutil.cpu_count(logical=True)
-    ram = str(round(psutil.virtual_memory().total / (1024.0**3))) + " ɢʙ"
+    snapshot = latest_stats()
+    ram = str(round(snapshot["ram_total"] / (1024.0**3))) + " ɢʙ"
     try:
         cpu_freq = psutil.cpu_freq().current
         if cpu_freq >= 1000:
@@ -94,15 +101,14 @@ async def bot_stats(client, CallbackQuery, _):
             cpu_freq = f"{round(cpu_freq, 2)}ᴍʜᴢ"
     except:
         cpu_freq = "ғᴀɪʟᴇᴅ ᴛᴏ ғᴇᴛᴄʜ"
-    hdd = psutil.disk_usage("/")
-    total = hdd.total / (1024.0**3)
-    used = hdd.used / (1024.0**3)
-    free = hdd.free / (1024.0**3)
+    total = snapshot["disk_total"] / (1024.0**3)
+    used = snapshot["disk_used"] / (1024.0**3)
+    free = snapshot["disk_free"] / (1024.0**3)
     call = await mongodb.command("dbstats")
     datasize = call["dataSize"] / 1024
     storage = call["storageSize"] / 1024
-    served_chats = len(await get_served_chats())
-    served_users = len(await get_served_users())
+    served_chats = await get_served_chats_count()
+    served_users = await get_served_users_count()
     text = _["gstats_5"].format(
         nand.mention,
         len(ALL_MODULES),
@@ -126,6 +132,17 @@ async def bot_stats(client, CallbackQuery, _):
         call["collections"],
         call["objects"],
     )
+    text += f"\n\n<b>ʟσσᴘ ʟᴀɢ :</b> <code>{monitor.summary()}</code>"
+    calls = " | ".join(
+        f"{num}: {count}" for num, count in sorted(snapshot["calls"].items(), key=str)
+    )
+    text += (
+        f"\n<b>ᴄᴘᴜ :</b> <code>{snapshot['cpu']}% {trend('cpu')}</code>"
+        f"\n<b>ʀᴀᴍ :</b> <code>{snapshot['ram']}% {trend('ram')}</code>"
+        f"\n<b>ɴᴇᴛ :</b> <code>↑ {snapshot['net_sent_rate'] / 1024:.1f} ᴋʙ/s | ↓ {snapshot['net_recv_rate'] / 1024:.1f} ᴋʙ/s</code>"
+        f"\n<b>ғғᴍᴘᴇɢ :</b> <code>{snapshot['ffmpeg']}</code> | <b>ғᴅs :</b> <code>{snapshot['fds']}</code>"
+        f"\n<b>ᴀssɪsᴛᴀɴᴛ ᴄᴀʟʟs :</b> <code>{calls or 0}</code>"
+    )
     med = InputMediaPhoto(media=config.STATS_IMG_URL, caption=text)
     try:
         await CallbackQuery.edit_message_media(media=med, reply_markup=upl)
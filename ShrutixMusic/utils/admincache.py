@@ -0,0 +1,41 @@
+from pyrogram.enums import ChatMembersFilter
+
+from ShrutixMusic import nand
+from ShrutixMusic.core.scheduler import scheduler
+from ShrutixMusic.utils.database import get_authuser_names, is_active_chat
+from ShrutixMusic.utils.formatters import alpha_to_int
+from config import adminlist
+
+ADMIN_CACHE_TTL = 1800
+
+
+async def refresh_admin_cache(chat_id: int):
+    admins = []
+    async for user in nand.get_chat_members(
+        chat_id, filter=ChatMembersFilter.ADMINISTRATORS
+    ):
+        if user.privileges.can_manage_video_chats:
+            admins.append(user.user.id)
+    authusers = await get_authuser_names(chat_id)
+    for user in authusers:
+        user_id = await alpha_to_int(user)
+        admins.append(user_id)
+    adminlist[chat_id] = admins
+
+
+async def admin_cache_timer(chat_id: int):
+    if not await is_active_chat(chat_id):
+        return
+    try:
+        await refresh_admin_cache(chat_id)
+    finally:
+        scheduler.schedule(
+            ("admincache", chat_id), ADMIN_CACHE_TTL, admin_cache_timer, chat_id
+        )
+
+
+def watch_admin_cache(chat_id: int):
+    if scheduler.pending(("admincache", chat_id)):
+        return
+    delay = ADMIN_CACHE_TTL if chat_id in adminlist else 0
+    scheduler.schedule(("admincache", chat_id), delay, admin_cache_timer, chat_id)
@@ -1,8 +1,16 @@
+import asyncio
 import random
+import time
+from collections import OrderedDict
 from typing import Dict, List, Union
 
+import config
 from ShrutixMusic import userbot
-from ShrutixMusic.core.mongo import mongodb
+from ShrutixMusic.core.metrics import metrics
+from ShrutixMusic.core.mongo import indexes, mongodb
+from ShrutixMusic.core.storage import bulk_requests
+from ShrutixMusic.core.supervisor import supervisor
+from ShrutixMusic.core.writebehind import writer
 
 authdb = mongodb.adminauth
 authuserdb = mongodb.authuser
@@ -11,6 +19,7 @@ assdb = mongodb.assistants
 blacklist_chatdb = mongodb.blacklistChat
 blockeddb = mongodb.blockedusers
 chatsdb = mongodb.chats
+chatsettingsdb = mongodb.chatsettings
 channeldb = mongodb.cplaymode
 countdb = mongodb.upcount
 gbansdb = mongodb.gban
@@ -22,21 +31,221 @@ skipdb = mongodb.skipmode
 sudoersdb = mongodb.sudoers
 usersdb = mongodb.tgusersdb
 
+# Indexes the lookups below filter on, created by the startup step
+indexes.declare(authuserdb, "chat_id", unique=True)
+indexes.declare(blacklist_chatdb, "chat_id", unique=True)
+indexes.declare(blockeddb, "user_id", unique=True)
+indexes.declare(chatsdb, "chat_id", unique=True)
+indexes.declare(chatsettingsdb, "chat_id", unique=True)
+indexes.declare(gbansdb, "user_id", unique=True)
+indexes.declare(onoffdb, "on_off")
+indexes.declare(usersdb, "user_id", unique=True)
+
+
+
+class ActiveChats:
+    def __init__(self):
+        # chat_id -> {"started", "assistant", "mode"}, in the order chats became active
+        self.chats = {}
+        self.snapshot = ()
+
+    def __contains__(self, chat_id) -> bool:
+        return chat_id in self.chats
+
+    def __len__(self) -> int:
+        return len(self.chats)
+
+    def __iter__(self):
+        # Background loops iterate the snapshot, so chats may come and go meanwhile
+        return iter(self.snapshot)
+
+    def add(self, chat_id: int, **info):
+        if chat_id in self.chats:
+            self.chats[chat_id].update(info)
+            return
+        self.chats[chat_id] = {"started": time.time(), **info}
+        self.snapshot = tuple(self.chats)
+
+    def update(self, chat_id: int, **info):
+        if chat_id in self.chats:
+            self.chats[chat_id].update(info)
+
+    def remove(self, chat_id: int):
+        if self.chats.pop(chat_id, None) is not None:
+            self.snapshot = tuple(self.chats)
+
+    def info(self, chat_id: int) -> dict:
+        return self.chats.get(chat_id)
+
+    def per_assistant(self) -> dict:
+        calls = {}
+        for info in self.chats.values():
+            num = info.get("assistant")
+            calls[num] = calls.get(num, 0) + 1
+        return calls
+
+
 # Shifting to memory [mongo sucks often]
-active = []
-activevideo = []
+active = ActiveChats()
+activevideo = ActiveChats()
 assistantdict = {}
-autoend = {}
-count = {}
-channelconnect = {}
-langm = {}
+assistantping = {}
+assistantflood = {}
+blacklisted = set()
+blocked = set()
 loop = {}
 maintenance = []
-nonadmin = {}
 pause = {}
-playmode = {}
-playtype = {}
-skipmode = {}
+
+# Served user and chat ids remembered by is_served_user/is_served_chat
+SERVED_CACHE_SIZE = 50000
+# Documents fetched per round trip when streaming a whole collection
+BATCH_SIZE = 1000
+# Seconds a collection count shown in the stats stays cached
+COUNT_TTL = 60
+counts = {}
+
+# Marks a key the cache has never loaded, so None and False can be cached too
+MISSING = object()
+
+
+class ReadThrough:
+    def __init__(self, load, size: int = None):
+        self.load = load
+        # Least recently used keys are dropped past size, None keeps everything
+        self.size = size
+        self.values = OrderedDict()
+        self.loading = {}
+
+    async def get(self, key):
+        value = self.values.get(key, MISSING)
+        if value is not MISSING:
+            if self.size:
+                self.values.move_to_end(key)
+            return value
+        task = self.loading.get(key)
+        if not task:
+            task = asyncio.ensure_future(self.load(key))
+            task.add_done_callback(lambda _: self.loading.pop(key, None))
+            self.loading[key] = task
+        value = await asyncio.shield(task)
+        # A set() that raced the load wins over what was read from the database
+        value = self.values.get(key, value)
+        self.set(key, value)
+        return value
+
+    def set(self, key, value):
+        self.values[key] = value
+        if self.size:
+            self.values.move_to_end(key)
+            while len(self.values) > self.size:
+                self.values.popitem(last=False)
+
+    async def refresh(self):
+        for key in list(self.values):
+            self.values[key] = await self.load(key)
+
+
+class ChatSettings:
+    __slots__ = (
+        "chat_id",
+        "lang",
+        "playmode",
+        "playtype",
+        "cmode",
+        "skipmode",
+        "upvotes",
+        "nonadmin",
+        "assistant",
+    )
+
+    def __init__(
+        self,
+        chat_id: int,
+        lang: str = "en",
+        playmode: str = "Direct",
+        playtype: str = "Everyone",
+        cmode: int = None,
+        skipmode: bool = True,
+        upvotes: int = 5,
+        nonadmin: bool = False,
+        assistant: int = None,
+    ):
+        self.chat_id = chat_id
+        self.lang = lang
+        self.playmode = playmode
+        self.playtype = playtype
+        self.cmode = cmode
+        self.skipmode = skipmode
+        self.upvotes = upvotes
+        self.nonadmin = nonadmin
+        self.assistant = assistant
+
+    @classmethod
+    def from_document(cls, document: dict):
+        return cls(**{key: document[key] for key in cls.__slots__ if key in document})
+
+
+# Old per-setting collections, as (collection, field in it, ChatSettings attribute)
+MIGRATED_FIELDS = [
+    (langdb, "lang", "lang"),
+    (playmodedb, "mode", "playmode"),
+    (playtypedb, "mode", "playtype"),
+    (channeldb, "mode", "cmode"),
+    (countdb, "mode", "upvotes"),
+    (assdb, "assistant", "assistant"),
+]
+# Old collections where a document existing at all was the setting
+MIGRATED_FLAGS = [
+    (skipdb, "skipmode", False),
+    (authdb, "nonadmin", True),
+]
+
+
+async def migrate_chat_settings() -> int:
+    if await chatsettingsdb.find_one({"_id": "migrated"}):
+        return 0
+    documents = {}
+    for collection, field, key in MIGRATED_FIELDS:
+        async for old in collection.find({}):
+            if "chat_id" in old and field in old:
+                documents.setdefault(old["chat_id"], {})[key] = old[field]
+    for collection, key, value in MIGRATED_FLAGS:
+        async for old in collection.find({}):
+            if "chat_id" in old:
+                documents.setdefault(old["chat_id"], {})[key] = value
+    requests = bulk_requests(
+        chatsettingsdb,
+        [
+            ({"chat_id": chat_id}, {"$set": fields}, True)
+            for chat_id, fields in documents.items()
+        ],
+    )
+    if requests:
+        await chatsettingsdb.bulk_write(requests, ordered=False)
+    await chatsettingsdb.insert_one({"_id": "migrated", "chats": len(documents)})
+    return len(documents)
+
+
+async def _load_chat_settings(chat_id: int) -> ChatSettings:
+    document = await chatsettingsdb.find_one({"chat_id": chat_id})
+    if not document:
+        return ChatSettings(chat_id)
+    return ChatSettings.from_document(document)
+
+
+chatsettings = ReadThrough(_load_chat_settings)
+
+
+async def get_chat_settings(chat_id: int) -> ChatSettings:
+    return await chatsettings.get(chat_id)
+
+
+async def update_chat_settings(chat_id: int, **fields):
+    settings = await get_chat_settings(chat_id)
+    for key, value in fields.items():
+        setattr(settings, key, value)
+    writer.upsert(chatsettingsdb, {"chat_id": chat_id}, fields)
 
 
 async def get_assistant_number(chat_id: int) -> str:
@@ -45,53 +254,69 @@ async def get_assistant_number(chat_id: int) -> str:
 
 
 async def get_client(assistant: int):
-    if int(assistant) == 1:
-        return userbot.one
-    elif int(assistant) == 2:
-        return userbot.two
-    elif int(assistant) == 3:
-        return userbot.three
-    elif int(assistant) == 4:
-        return userbot.four
-    elif int(assistant) == 5:
-        return userbot.five
+    return userbot.get(assistant)
 
 
 async def set_assistant_new(chat_id, number):
     number = int(number)
-    await assdb.update_one(
-        {"chat_id": chat_id},
-        {"$set": {"assistant": number}},
-        upsert=True,
-    )
+    await update_chat_settings(chat_id, assistant=number)
 
 
-async def set_assistant(chat_id):
+def record_assistant_ping(assistant: int, ping: float):
+    assistantping[int(assistant)] = ping
+
+
+def record_assistant_flood(assistant: int, seconds: int):
+    metrics.inc("floodwait_total", assistant=int(assistant))
+    assistantflood.setdefault(int(assistant), []).append(time.time() + int(seconds))
+
+
+def assistant_load(assistant: int) -> float:
+    assistant = int(assistant)
+    now = time.time()
+    floods = [until for until in assistantflood.get(assistant, []) if until + 600 > now]
+    assistantflood[assistant] = floods
+    calls = active.per_assistant().get(assistant, 0)
+    load = calls + 2 * len(floods) + assistantping.get(assistant, 0) / 100
+    if floods and max(floods) > now:
+        load += 100
+    return load
+
+
+def least_loaded_assistant() -> int:
     from ShrutixMusic.core.userbot import assistants
 
-    ran_assistant = random.choice(assistants)
+    candidates = list(assistants)
+    random.shuffle(candidates)
+    return min(candidates, key=assistant_load)
+
+
+async def set_assistant(chat_id):
+    ran_assistant = least_loaded_assistant()
     assistantdict[chat_id] = ran_assistant
-    await assdb.update_one(
-        {"chat_id": chat_id},
-        {"$set": {"assistant": ran_assistant}},
-        upsert=True,
-    )
+    await update_chat_settings(chat_id, assistant=ran_assistant)
     userbot = await get_client(ran_assistant)
     return userbot
 
 
+def should_rebalance(chat_id: int, assistant: int) -> bool:
+    if not config.ASSISTANT_REBALANCE or chat_id in active:
+        return False
+    best = least_loaded_assistant()
+    return assistant_load(assistant) - assistant_load(best) >= 2
+
+
 async def get_assistant(chat_id: int) -> str:
     from ShrutixMusic.core.userbot import assistants
 
     assistant = assistantdict.get(chat_id)
     if not assistant:
-        dbassistant = await assdb.find_one({"chat_id": chat_id})
-        if not dbassistant:
+        got_assis = (await get_chat_settings(chat_id)).assistant
+        if not got_assis:
             userbot = await set_assistant(chat_id)
             return userbot
         else:
-            got_assis = dbassistant["assistant"]
-            if got_assis in assistants:
+            if got_assis in assistants and not should_rebalance(chat_id, got_assis):
                 assistantdict[chat_id] = got_assis
                 userbot = await get_client(got_assis)
                 return userbot
@@ -99,7 +324,7 @@ async def get_assistant(chat_id: int) -> str:
                 userbot = await set_assistant(chat_id)
                 return userbot
     else:
-        if assistant in assistants:
+        if assistant in assistants and not should_rebalance(chat_id, assistant):
             userbot = await get_client(assistant)
             return userbot
         else:
@@ -108,15 +333,9 @@ async def get_assistant(chat_id: int) -> str:
 
 
 async def set_calls_assistant(chat_id):
-    from ShrutixMusic.core.userbot import assistants
-
-    ran_assistant = random.choice(assistants)
+    ran_assistant = least_loaded_assistant()
     assistantdict[chat_id] = ran_assistant
-    await assdb.update_one(
-        {"chat_id": chat_id},
-        {"$set": {"assistant": ran_assistant}},
-        upsert=True,
-    )
+    await update_chat_settings(chat_id, assistant=ran_assistant)
     return ran_assistant
 
 
@@ -125,11 +344,10 @@ async def group_assistant(self, chat_id: int) -> int:
 
     assistant = assistantdict.get(chat_id)
     if not assistant:
-        dbassistant = await assdb.find_one({"chat_id": chat_id})
-        if not dbassistant:
+        assis = (await get_chat_settings(chat_id)).assistant
+        if not assis:
             assis = await set_calls_assistant(chat_id)
         else:
-            assis = dbassistant["assistant"]
             if assis in assistants:
                 assistantdict[chat_id] = assis
                 assis = assis
@@ -140,78 +358,56 @@ async def group_assistant(self, chat_id: int) -> int:
             assis = assistant
         else:
             assis = await set_calls_assistant(chat_id)
-    if int(assis) == 1:
-        return self.one
-    elif int(assis) == 2:
-        return self.two
-    elif int(assis) == 3:
-        return self.three
-    elif int(assis) == 4:
-        return self.four
-    elif int(assis) == 5:
-        return self.five
+    return self[assis]
 
 
 async def is_skipmode(chat_id: int) -> bool:
-    mode = skipmode.get(chat_id)
-    if not mode:
-        user = await skipdb.find_one({"chat_id": chat_id})
-        if not user:
-            skipmode[chat_id] = True
-            return True
-        skipmode[chat_id] = False
-        return False
-    return mode
+    return (await get_chat_settings(chat_id)).skipmode
 
 
 async def skip_on(chat_id: int):
-    skipmode[chat_id] = True
-    user = await skipdb.find_one({"chat_id": chat_id})
-    if user:
-        return await skipdb.delete_one({"chat_id": chat_id})
+    await update_chat_settings(chat_id, skipmode=True)
 
 
 async def skip_off(chat_id: int):
-    skipmode[chat_id] = False
-    user = await skipdb.find_one({"chat_id": chat_id})
-    if not user:
-        return await skipdb.insert_one({"chat_id": chat_id})
+    await update_chat_settings(chat_id, skipmode=False)
 
 
 async def get_upvote_count(chat_id: int) -> int:
-    mode = count.get(chat_id)
-    if not mode:
-        mode = await countdb.find_one({"chat_id": chat_id})
-        if not mode:
-            return 5
-        count[chat_id] = mode["mode"]
-        return mode["mode"]
-    return mode
+    return (await get_chat_settings(chat_id)).upvotes
 
 
 async def set_upvotes(chat_id: int, mode: int):
-    count[chat_id] = mode
-    await countdb.update_one(
-        {"chat_id": chat_id}, {"$set": {"mode": mode}}, upsert=True
-    )
+    await update_chat_settings(chat_id, upvotes=mode)
 
 
-async def is_autoend() -> bool:
-    chat_id = 1234
+async def _load_autoend(chat_id: int) -> bool:
     user = await autoenddb.find_one({"chat_id": chat_id})
     if not user:
         return False
     return True
 
 
+autoend = ReadThrough(_load_autoend)
+
+
+async def is_autoend() -> bool:
+    chat_id = 1234
+    return await autoend.get(chat_id)
+
+
 async def autoend_on():
     chat_id = 1234
-    await autoenddb.insert_one({"chat_id": chat_id})
+    autoend.set(chat_id, True)
+    await autoenddb.update_one(
+        {"chat_id": chat_id}, {"$set": {"chat_id": chat_id}}, upsert=True
+    )
 
 
 async def autoend_off():
     chat_id = 1234
-    await autoenddb.delete_one({"chat_id": chat_id})
+    autoend.set(chat_id, False)
+    await autoenddb.delete_many({"chat_id": chat_id})
 
 
 async def get_loop(chat_id: int) -> int:
@@ -226,76 +422,35 @@ async def set_loop(chat_id: int, mode: int):
 
 
 async def get_cmode(chat_id: int) -> int:
-    mode = channelconnect.get(chat_id)
-    if not mode:
-        mode = await channeldb.find_one({"chat_id": chat_id})
-        if not mode:
-            return None
-        channelconnect[chat_id] = mode["mode"]
-        return mode["mode"]
-    return mode
+    return (await get_chat_settings(chat_id)).cmode
 
 
 async def set_cmode(chat_id: int, mode: int):
-    channelconnect[chat_id] = mode
-    await channeldb.update_one(
-        {"chat_id": chat_id}, {"$set": {"mode": mode}}, upsert=True
-    )
+    await update_chat_settings(chat_id, cmode=mode)
 
 
 async def get_playtype(chat_id: int) -> str:
-    mode = playtype.get(chat_id)
-    if not mode:
-        mode = await playtypedb.find_one({"chat_id": chat_id})
-        if not mode:
-            playtype[chat_id] = "Everyone"
-            return "Everyone"
-        playtype[chat_id] = mode["mode"]
-        return mode["mode"]
-    return mode
+    return (await get_chat_settings(chat_id)).playtype
 
 
 async def set_playtype(chat_id: int, mode: str):
-    playtype[chat_id] = mode
-    await playtypedb.update_one(
-        {"chat_id": chat_id}, {"$set": {"mode": mode}}, upsert=True
-    )
+    await update_chat_settings(chat_id, playtype=mode)
 
 
 async def get_playmode(chat_id: int) -> str:
-    mode = playmode.get(chat_id)
-    if not mode:
-        mode = await playmodedb.find_one({"chat_id": chat_id})
-        if not mode:
-            playmode[chat_id] = "Direct"
-            return "Direct"
-        playmode[chat_id] = mode["mode"]
-        return mode["mode"]
-    return mode
+    return (await get_chat_settings(chat_id)).playmode
 
 
 async def set_playmode(chat_id: int, mode: str):
-    playmode[chat_id] = mode
-    await playmodedb.update_one(
-        {"chat_id": chat_id}, {"$set": {"mode": mode}}, upsert=True
-    )
+    await update_chat_settings(chat_id, playmode=mode)
 
 
 async def get_lang(chat_id: int) -> str:
-    mode = langm.get(chat_id)
-    if not mode:
-        lang = await langdb.find_one({"chat_id": chat_id})
-        if not lang:
-            langm[chat_id] = "en"
-            return "en"
-        langm[chat_id] = lang["lang"]
-        return lang["lang"]
-    return mode
+    return (await get_chat_settings(chat_id)).lang
 
 
 async def set_lang(chat_id: int, lang: str):
-    langm[chat_id] = lang
-    await langdb.update_one({"chat_id": chat_id}, {"$set": {"lang": lang}}, upsert=True)
+    await update_chat_settings(chat_id, lang=lang)
 
 
 async def is_music_playing(chat_id: int) -> bool:
@@ -313,94 +468,83 @@ async def music_off(chat_id: int):
     pause[chat_id] = False
 
 
-async def get_active_chats() -> list:
-    return active
+async def get_active_chats() -> tuple:
+    return active.snapshot
+
+
+async def get_active_chat_info(chat_id: int) -> dict:
+    return active.info(chat_id)
 
 
 async def is_active_chat(chat_id: int) -> bool:
-    if chat_id not in active:
-        return False
-    else:
-        return True
+    return chat_id in active
 
 
 async def add_active_chat(chat_id: int):
-    if chat_id not in active:
-        active.append(chat_id)
+    active.add(
+        chat_id,
+        assistant=assistantdict.get(chat_id),
+        mode="video" if chat_id in activevideo else "audio",
+    )
 
 
 async def remove_active_chat(chat_id: int):
-    if chat_id in active:
-        active.remove(chat_id)
+    active.remove(chat_id)
 
 
-async def get_active_video_chats() -> list:
-    return activevideo
+async def get_active_video_chats() -> tuple:
+    return activevideo.snapshot
 
 
 async def is_active_video_chat(chat_id: int) -> bool:
-    if chat_id not in activevideo:
-        return False
-    else:
-        return True
+    return chat_id in activevideo
 
 
 async def add_active_video_chat(chat_id: int):
-    if chat_id not in activevideo:
-        activevideo.append(chat_id)
+    activevideo.add(chat_id)
+    active.update(chat_id, mode="video")
 
 
 async def remove_active_video_chat(chat_id: int):
-    if chat_id in activevideo:
-        activevideo.remove(chat_id)
+    activevideo.remove(chat_id)
+    active.update(chat_id, mode="audio")
 
 
 async def check_nonadmin_chat(chat_id: int) -> bool:
-    user = await authdb.find_one({"chat_id": chat_id})
-    if not user:
-        return False
-    return True
+    return (await get_chat_settings(chat_id)).nonadmin
 
 
 async def is_nonadmin_chat(chat_id: int) -> bool:
-    mode = nonadmin.get(chat_id)
-    if not mode:
-        user = await authdb.find_one({"chat_id": chat_id})
-        if not user:
-            nonadmin[chat_id] = False
-            return False
-        nonadmin[chat_id] = True
-        return True
-    return mode
+    return (await get_chat_settings(chat_id)).nonadmin
 
 
 async def add_nonadmin_chat(chat_id: int):
-    nonadmin[chat_id] = True
-    is_admin = await check_nonadmin_chat(chat_id)
-    if is_admin:
-        return
-    return await authdb.insert_one({"chat_id": chat_id})
+    await update_chat_settings(chat_id, nonadmin=True)
 
 
 async def remove_nonadmin_chat(chat_id: int):
-    nonadmin[chat_id] = False
-    is_admin = await check_nonadmin_chat(chat_id)
-    if not is_admin:
-        return
-    return await authdb.delete_one({"chat_id": chat_id})
+    await update_chat_settings(chat_id, nonadmin=False)
 
 
-async def is_on_off(on_off: int) -> bool:
+async def _load_on_off(on_off: int) -> bool:
     onoff = await onoffdb.find_one({"on_off": on_off})
     if not onoff:
         return False
     return True
 
 
+onoff = ReadThrough(_load_on_off)
+
+
+async def is_on_off(on_off: int) -> bool:
+    return await onoff.get(on_off)
+
+
 async def add_on(on_off: int):
     is_on = await is_on_off(on_off)
     if is_on:
         return
+    onoff.set(on_off, True)
     return await onoffdb.insert_one({"on_off": on_off})
 
 
@@ -408,9 +552,21 @@ async def add_off(on_off: int):
     is_off = await is_on_off(on_off)
     if not is_off:
         return
+    onoff.set(on_off, False)
     return await onoffdb.delete_one({"on_off": on_off})
 
 
+# Another instance sharing the database can flip these flags, so re-read them now and then
+if config.FLAG_RECONCILE_INTERVAL:
+
+    @supervisor.job(config.FLAG_RECONCILE_INTERVAL)
+    async def reconcile_flags():
+        await autoend.refresh()
+        await onoff.refresh()
+        await load_blacklists()
+        maintenance.clear()
+
+
 async def is_maintenance():
     if not maintenance:
         get = await onoffdb.find_one({"on_off": 1})
@@ -432,82 +588,133 @@ async def is_maintenance():
 async def maintenance_off():
     maintenance.clear()
     maintenance.append(2)
-    is_off = await is_on_off(1)
-    if not is_off:
-        return
-    return await onoffdb.delete_one({"on_off": 1})
+    return await add_off(1)
 
 
 async def maintenance_on():
     maintenance.clear()
     maintenance.append(1)
-    is_on = await is_on_off(1)
-    if is_on:
-        return
-    return await onoffdb.insert_one({"on_off": 1})
+    return await add_on(1)
 
 
-async def is_served_user(user_id: int) -> bool:
+async def _load_served_user(user_id: int) -> bool:
     user = await usersdb.find_one({"user_id": user_id})
     if not user:
         return False
     return True
 
 
+servedusers = ReadThrough(_load_served_user, SERVED_CACHE_SIZE)
+
+
+async def is_served_user(user_id: int) -> bool:
+    return await servedusers.get(user_id)
+
+
+async def _ids(collection, field: str, query: dict):
+    cursor = collection.find(query, {field: 1, "_id": 0}).batch_size(BATCH_SIZE)
+    async for document in cursor:
+        yield document[field]
+
+
+async def _count(collection, query: dict) -> int:
+    cached = counts.get(collection.name)
+    if cached and cached[0] > time.monotonic():
+        return cached[1]
+    value = await collection.count_documents(query)
+    counts[collection.name] = (time.monotonic() + COUNT_TTL, value)
+    return value
+
+
+def iter_served_users():
+    return _ids(usersdb, "user_id", {"user_id": {"$gt": 0}})
+
+
+async def get_served_users_count() -> int:
+    return await _count(usersdb, {"user_id": {"$gt": 0}})
+
+
 async def get_served_users() -> list:
-    users_list = []
-    async for user in usersdb.find({"user_id": {"$gt": 0}}):
-        users_list.append(user)
-    return users_list
+    return [{"user_id": user_id} async for user_id in iter_served_users()]
 
 
 async def add_served_user(user_id: int):
-    is_served = await is_served_user(user_id)
-    if is_served:
+    # No need to look the user up first, the queued write is an upsert
+    if servedusers.values.get(user_id):
         return
-    return await usersdb.insert_one({"user_id": user_id})
+    servedusers.set(user_id, True)
+    writer.upsert(usersdb, {"user_id": user_id})
+
+
+def iter_served_chats():
+    return _ids(chatsdb, "chat_id", {"chat_id": {"$lt": 0}})
+
+
+async def get_served_chats_count() -> int:
+    return await _count(chatsdb, {"chat_id": {"$lt": 0}})
 
 
 async def get_served_chats() -> list:
-    chats_list = []
-    async for chat in chatsdb.find({"chat_id": {"$lt": 0}}):
-        chats_list.append(chat)
-    return chats_list
+    return [{"chat_id": chat_id} async for chat_id in iter_served_chats()]
 
 
-async def is_served_chat(chat_id: int) -> bool:
+async def _load_served_chat(chat_id: int) -> bool:
     chat = await chatsdb.find_one({"chat_id": chat_id})
     if not chat:
         return False
     return True
 
 
+servedchats = ReadThrough(_load_served_chat, SERVED_CACHE_SIZE)
+
+
+async def is_served_chat(chat_id: int) -> bool:
+    return await servedchats.get(chat_id)
+
+
 async def add_served_chat(chat_id: int):
-    is_served = await is_served_chat(chat_id)
-    if is_served:
+    if servedchats.values.get(chat_id):
         return
-    return await chatsdb.insert_one({"chat_id": chat_id})
+    servedchats.set(chat_id, True)
+    writer.upsert(chatsdb, {"chat_id": chat_id})
+
+
+async def load_blacklists():
+    chats = {
+        chat_id
+        async for chat_id in _ids(blacklist_chatdb, "chat_id", {"chat_id": {"$lt": 0}})
+    }
+    users = {user_id async for user_id in iter_banned_users()}
+    blacklisted.clear()
+    blacklisted.update(chats)
+    blocked.clear()
+    blocked.update(users)
 
 
 async def blacklisted_chats() -> list:
-    chats_list = []
-    async for chat in blacklist_chatdb.find({"chat_id": {"$lt": 0}}):
-        chats_list.append(chat["chat_id"])
-    return chats_list
+    return list(blacklisted)
+
+
+async def is_blacklisted_chat(chat_id: int) -> bool:
+    return chat_id in blacklisted
 
 
 async def blacklist_chat(chat_id: int) -> bool:
-    if not await blacklist_chatdb.find_one({"chat_id": chat_id}):
-        await blacklist_chatdb.insert_one({"chat_id": chat_id})
-        return True
-    return False
+    if chat_id in blacklisted:
+        return False
+    blacklisted.add(chat_id)
+    await blacklist_chatdb.update_one(
+        {"chat_id": chat_id}, {"$set": {"chat_id": chat_id}}, upsert=True
+    )
+    return True
 
 
 async def whitelist_chat(chat_id: int) -> bool:
-    if await blacklist_chatdb.find_one({"chat_id": chat_id}):
-        await blacklist_chatdb.delete_one({"chat_id": chat_id})
-        return True
-    return False
+    if chat_id not in blacklisted:
+        return False
+    blacklisted.discard(chat_id)
+    await blacklist_chatdb.delete_one({"chat_id": chat_id})
+    return True
 
 
 async def _get_authusers(chat_id: int) -> Dict[str, int]:
@@ -517,16 +724,20 @@ async def _get_authusers(chat_id: int) -> Dict[str, int]:
     return _notes["notes"]
 
 
+# chat_id -> {token: note}, its keys are the set of auth user tokens
+authusers = ReadThrough(_get_authusers)
+
+
 async def get_authuser_names(chat_id: int) -> List[str]:
-    _notes = []
-    for note in await _get_authusers(chat_id):
-        _notes.append(note)
-    return _notes
+    return list(await authusers.get(chat_id))
+
+
+async def is_authuser(chat_id: int, name: str) -> bool:
+    return name in await authusers.get(chat_id)
 
 
 async def get_authuser(chat_id: int, name: str) -> Union[bool, dict]:
-    name = name
-    _notes = await _get_authusers(chat_id)
+    _notes = await authusers.get(chat_id)
     if name in _notes:
         return _notes[name]
     else:
@@ -534,35 +745,30 @@ async def get_authuser(chat_id: int, name: str) -> Union[bool, dict]:
 
 
 async def save_authuser(chat_id: int, name: str, note: dict):
-    name = name
-    _notes = await _get_authusers(chat_id)
+    _notes = await authusers.get(chat_id)
     _notes[name] = note
-
     await authuserdb.update_one(
-        {"chat_id": chat_id}, {"$set": {"notes": _notes}}, upsert=True
+        {"chat_id": chat_id}, {"$set": {f"notes.{name}": note}}, upsert=True
     )
 
 
 async def delete_authuser(chat_id: int, name: str) -> bool:
-    notesd = await _get_authusers(chat_id)
-    name = name
+    notesd = await authusers.get(chat_id)
     if name in notesd:
         del notesd[name]
         await authuserdb.update_one(
-            {"chat_id": chat_id},
-            {"$set": {"notes": notesd}},
-            upsert=True,
+            {"chat_id": chat_id}, {"$unset": {f"notes.{name}": ""}}
         )
         return True
     return False
 
 
+def iter_gbanned():
+    return _ids(gbansdb, "user_id", {"user_id": {"$gt": 0}})
+
+
 async def get_gbanned() -> list:
-    results = []
-    async for user in gbansdb.find({"user_id": {"$gt": 0}}):
-        user_id = user["user_id"]
-        results.append(user_id)
-    return results
+    return [user_id async for user_id in iter_gbanned()]
 
 
 async def is_gbanned_user(user_id: int) -> bool:
@@ -611,31 +817,27 @@ async def remove_sudo(user_id: int) -> bool:
     return True
 
 
+def iter_banned_users():
+    return _ids(blockeddb, "user_id", {"user_id": {"$gt": 0}})
+
+
 async def get_banned_users() -> list:
-    results = []
-    async for user in blockeddb.find({"user_id": {"$gt": 0}}):
-        user_id = user["user_id"]
-        results.append(user_id)
-    return results
+    return list(blocked)
 
 
 async def get_banned_count() -> int:
-    users = blockeddb.find({"user_id": {"$gt": 0}})
-    users = await users.to_list(length=100000)
-    return len(users)
+    return len(blocked)
 
 
 async def is_banned_user(user_id: int) -> bool:
-    user = await blockeddb.find_one({"user_id": user_id})
-    if not user:
-        return False
-    return True
+    return user_id in blocked
 
 
 async def add_banned_user(user_id: int):
     is_gbanned = await is_banned_user(user_id)
     if is_gbanned:
         return
+    blocked.add(user_id)
     return await blockeddb.insert_one({"user_id": user_id})
 
 
@@ -643,4 +845,5 @@ async def remove_banned_user(user_id: int):
     is_gbanned = await is_banned_user(user_id)
     if not is_gbanned:
         return
+    blocked.discard(user_id)
     return await blockeddb.delete_one({"user_id": user_id})
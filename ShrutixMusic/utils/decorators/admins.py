@@ -2,22 +2,33 @@ from pyrogram.enums import ChatType
 from pyrogram.types import InlineKeyboardButton, InlineKeyboardMarkup
 
 from ShrutixMusic import nand
+from ShrutixMusic.core.scheduler import scheduler
 from ShrutixMusic.misc import SUDOERS, db
 from ShrutixMusic.utils.database import (
-    get_authuser_names,
     get_cmode,
     get_lang,
     get_upvote_count,
     is_active_chat,
+    is_authuser,
     is_maintenance,
     is_nonadmin_chat,
     is_skipmode,
 )
-from config import SUPPORT_CHAT, adminlist, confirmer
+from config import SUPPORT_CHAT, adminlist, confirmer, upvoters, votemode
 from strings import get_string
 
 from ..formatters import int_to_alpha
 
+VOTE_EXPIRY = 600
+
+
+async def expire_vote(chat_id: int, message_id: int):
+    for votes in (confirmer, upvoters, votemode):
+        try:
+            del votes[chat_id][message_id]
+        except KeyError:
+            pass
+
 
 def AdminRightsCheck(mystic):
     async def wrapper(client, message):
@@ -106,6 +117,13 @@ def AdminRightsCheck(mystic):
                                 "vidid": vidid,
                                 "file": file,
                             }
+                            scheduler.schedule(
+                                ("vote", chat_id, senn.id),
+                                VOTE_EXPIRY,
+                                expire_vote,
+                                chat_id,
+                                senn.id,
+                            )
                             return
                         else:
                             return await message.reply_text(_["admin_14"])
@@ -189,8 +207,7 @@ def ActualAdminCB(mystic):
             if not a.can_manage_video_chats:
                 if CallbackQuery.from_user.id not in SUDOERS:
                     token = await int_to_alpha(CallbackQuery.from_user.id)
-                    _check = await get_authuser_names(CallbackQuery.from_user.id)
-                    if token not in _check:
+                    if not await is_authuser(CallbackQuery.message.chat.id, token):
                         try:
                             return await CallbackQuery.answer(
                                 _["general_4"],
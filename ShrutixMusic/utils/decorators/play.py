@@ -3,6 +3,7 @@ import asyncio
 from pyrogram.enums import ChatMemberStatus
 from pyrogram.errors import (
     ChatAdminRequired,
+    FloodWait,
     InviteRequestSent,
     UserAlreadyParticipant,
     UserNotParticipant,
@@ -10,15 +11,18 @@ from pyrogram.errors import (
 from pyrogram.types import InlineKeyboardButton, InlineKeyboardMarkup
 
 from ShrutixMusic import YouTube, nand
+from ShrutixMusic.core.tracing import tracer
 from ShrutixMusic.misc import SUDOERS
 from ShrutixMusic.utils.database import (
     get_assistant,
+    get_assistant_number,
     get_cmode,
     get_lang,
     get_playmode,
     get_playtype,
     is_active_chat,
     is_maintenance,
+    record_assistant_flood,
 )
 from ShrutixMusic.utils.inline import botplaylist_markup
 from config import PLAYLIST_IMG_URL, SUPPORT_CHAT, adminlist
@@ -29,7 +33,12 @@ links = {}
 
 def PlayWrapper(command):
     async def wrapper(client, message):
-        language = await get_lang(message.chat.id)
+        with tracer.trace("play", chat_id=message.chat.id, command=message.command[0]):
+            return await checks(client, message)
+
+    async def checks(client, message):
+        with tracer.span("language"):
+            language = await get_lang(message.chat.id)
         _ = get_string(language)
         if message.sender_chat:
             upl = InlineKeyboardMarkup(
@@ -44,7 +53,9 @@ def PlayWrapper(command):
             )
             return await message.reply_text(_["general_3"], reply_markup=upl)
 
-        if await is_maintenance() is False:
+        with tracer.span("maintenance"):
+            maintenance = await is_maintenance()
+        if maintenance is False:
             if message.from_user.id not in SUDOERS:
                 return await message.reply_text(
                     text=f"{nand.mention} ɪs ᴜɴᴅᴇʀ ᴍᴀɪɴᴛᴇɴᴀɴᴄᴇ, ᴠɪsɪᴛ <a href={SUPPORT_CHAT}>sᴜᴘᴘᴏʀᴛ ᴄʜᴀᴛ</a> ғᴏʀ ᴋɴᴏᴡɪɴɢ ᴛʜᴇ ʀᴇᴀsᴏɴ.",
@@ -114,10 +125,12 @@ def PlayWrapper(command):
             fplay = None
 
         if not await is_active_chat(chat_id):
-            userbot = await get_assistant(chat_id)
+            with tracer.span("assistant"):
+                userbot = await get_assistant(chat_id)
             try:
                 try:
-                    get = await nand.get_chat_member(chat_id, userbot.id)
+                    with tracer.span("assistant check"):
+                        get = await nand.get_chat_member(chat_id, userbot.id)
                 except ChatAdminRequired:
                     return await message.reply_text(_["call_1"])
                 if (
@@ -169,7 +182,8 @@ def PlayWrapper(command):
                 myu = await message.reply_text(_["call_4"].format(nand.mention))
                 try:
                     await asyncio.sleep(1)
-                    await userbot.join_chat(invitelink)
+                    with tracer.span("assistant join"):
+                        await userbot.join_chat(invitelink)
                 except InviteRequestSent:
                     try:
                         await nand.approve_chat_join_request(chat_id, userbot.id)
@@ -181,6 +195,13 @@ def PlayWrapper(command):
                     await myu.edit(_["call_5"].format(nand.mention))
                 except UserAlreadyParticipant:
                     pass
+                except FloodWait as fw:
+                    record_assistant_flood(
+                        await get_assistant_number(chat_id), fw.value
+                    )
+                    return await message.reply_text(
+                        _["call_3"].format(nand.mention, type(fw).__name__)
+                    )
                 except Exception as e:
                     return await message.reply_text(
                         _["call_3"].format(nand.mention, type(e).__name__)
@@ -1,11 +1,13 @@
 import asyncio
 from typing import Union
 
+from ShrutixMusic.core.tracing import tracer
 from ShrutixMusic.misc import db
 from ShrutixMusic.utils.formatters import check_duration, seconds_to_min
 from config import autoclean, time_to_seconds
 
 
+@tracer.traced("put_queue")
 async def put_queue(
     chat_id,
     original_chat_id,
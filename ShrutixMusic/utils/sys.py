@@ -1,15 +1,100 @@
+import asyncio
 import time
+from collections import deque
 
 import psutil
 
+from ShrutixMusic.core.supervisor import supervisor
 from ShrutixMusic.misc import _boot_
+from ShrutixMusic.utils.database import active
 from ShrutixMusic.utils.formatters import get_readable_time
 
+SAMPLE_INTERVAL = 10
+# Ten minutes of samples, enough for the trend line in the stats panel
+history = deque(maxlen=60)
+
+SPARKS = "▁▂▃▄▅▆▇█"
+
+# The first cpu_percent(interval=None) call always returns 0.0, make it now
+psutil.cpu_percent(interval=None)
+
+
+def _ffmpeg_count(process: psutil.Process) -> int:
+    count = 0
+    for child in process.children(recursive=True):
+        try:
+            if "ffmpeg" in child.name():
+                count += 1
+        except psutil.Error:
+            continue
+    return count
+
+
+def sample_system(calls: dict = None, last: dict = None) -> dict:
+    process = psutil.Process()
+    memory = psutil.virtual_memory()
+    disk = psutil.disk_usage("/")
+    net = psutil.net_io_counters()
+    try:
+        fds = process.num_fds()
+    except AttributeError:
+        fds = process.num_handles()
+    now = time.time()
+    snapshot = {
+        "time": now,
+        "cpu": psutil.cpu_percent(interval=None),
+        "ram": memory.percent,
+        "ram_total": memory.total,
+        "disk": disk.percent,
+        "disk_total": disk.total,
+        "disk_used": disk.used,
+        "disk_free": disk.free,
+        "net_sent": net.bytes_sent,
+        "net_recv": net.bytes_recv,
+        "net_sent_rate": 0.0,
+        "net_recv_rate": 0.0,
+        "fds": fds,
+        "ffmpeg": _ffmpeg_count(process),
+        "calls": calls or {},
+    }
+    if last:
+        elapsed = max(now - last["time"], 1e-6)
+        snapshot["net_sent_rate"] = (net.bytes_sent - last["net_sent"]) / elapsed
+        snapshot["net_recv_rate"] = (net.bytes_recv - last["net_recv"]) / elapsed
+    return snapshot
+
+
+def assistant_calls() -> dict:
+    return active.per_assistant()
+
+
+@supervisor.job(SAMPLE_INTERVAL)
+async def system_sampler():
+    loop = asyncio.get_running_loop()
+    last = history[-1] if history else None
+    # Sampled in a thread, but history is only touched from the event loop
+    snapshot = await loop.run_in_executor(None, sample_system, assistant_calls(), last)
+    history.append(snapshot)
+
+
+def latest_stats() -> dict:
+    if not history:
+        history.append(sample_system(assistant_calls()))
+    return history[-1]
+
+
+def trend(key: str) -> str:
+    return "".join(
+        SPARKS[min(int(sample[key] / 100 * len(SPARKS)), len(SPARKS) - 1)]
+        for sample in history
+    )
+
 
 async def bot_sys_stats():
+    stats = latest_stats()
     bot_uptime = int(time.time() - _boot_)
     UP = f"{get_readable_time(bot_uptime)}"
-    CPU = f"{psutil.cpu_percent(interval=0.5)}%"
-    RAM = f"{psutil.virtual_memory().percent}%"
-    DISK = f"{psutil.disk_usage('/').percent}%"
+    CPU = f"{stats['cpu']}%"
+    RAM = f"{stats['ram']}%"
+    DISK = f"{stats['disk']}%"
     return UP, CPU, RAM, DISK
@@ -30,6 +30,8 @@ from pathlib import Path
 from PIL import Image, ImageDraw, ImageFilter, ImageFont, ImageEnhance
 from py_yt import VideosSearch
 
+from ShrutixMusic.core.tracing import tracer
+
 CACHE_DIR = Path("cache")
 CACHE_DIR.mkdir(exist_ok=True)
 
@@ -109,6 +111,7 @@ def fit_title_two_lines(draw, text, max_width, font_path, start_size=58, min_siz
             return ImageFont.load_default(), text[:50]
 
 
+@tracer.traced("thumbnail")
 async def get_thumb(videoid: str):
     url = f"https://www.youtube.com/watch?v={videoid}"
     thumb_path = None
@@ -0,0 +1,74 @@
+import argparse
+import asyncio
+import os
+import sys
+
+from benchmarks.env import Environment
+from benchmarks.runner import (
+    benchmarks,
+    compare,
+    load_baseline,
+    measure,
+    save_baseline,
+    table,
+)
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BASELINE = os.path.join(ROOT, "benchmarks", "baseline.json")
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks",
+        description="Run the offline benchmarks against fake Telegram, call and Mongo clients.",
+    )
+    parser.add_argument("names", nargs="*", help="only run benchmarks whose name contains one of these")
+    parser.add_argument("--baseline", default=BASELINE, help="baseline file to compare against")
+    parser.add_argument("--save", action="store_true", help="store the results as the new baseline")
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.3,
+        help="allowed slowdown against the baseline before failing (0.3 = 30%%)",
+    )
+    parser.add_argument("--latency", type=float, default=0, help="simulated latency of every fake call, in seconds")
+    return parser.parse_args()
+
+
+async def run(args) -> int:
+    results = {}
+    for name, bench in benchmarks.items():
+        if args.names and not any(part in name for part in args.names):
+            continue
+        print(f"running {name}...", file=sys.stderr)
+        results[name] = await measure(bench)
+
+    baseline = load_baseline(args.baseline)
+    print(table(results, baseline))
+    if args.save:
+        save_baseline(args.baseline, {**baseline, **results})
+        print(f"\nbaseline saved to {args.baseline}")
+        return 0
+    if not baseline:
+        print(f"\nno baseline at {args.baseline}, run with --save to create one")
+        return 0
+    regressions = compare(results, baseline, args.tolerance)
+    if regressions:
+        print("\nregressions:")
+        for line in regressions:
+            print(f"  {line}")
+        return 1
+    print("\nno regressions")
+    return 0
+
+
+def main() -> int:
+    args = parse_args()
+    Environment(latency=args.latency).prepare()
+    import benchmarks.suite  # noqa: F401 registers the benchmarks
+
+    return asyncio.get_event_loop().run_until_complete(run(args))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
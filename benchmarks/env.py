@@ -0,0 +1,113 @@
+import atexit
+import logging
+import os
+import shutil
+import sys
+import tempfile
+
+from benchmarks.fakes import (
+    FakeAssistant,
+    FakeBot,
+    FakeCalls,
+    FakeDownloader,
+    FakeMotorClient,
+    FakeSession,
+    FakeVideosSearch,
+)
+
+# Dummy credentials, nothing here ever reaches Telegram or Mongo
+ENVIRONMENT = {
+    "API_ID": "1",
+    "API_HASH": "0" * 32,
+    "BOT_TOKEN": "1:benchmark",
+    "MONGO_DB_URI": "mongodb://localhost:27017",
+    "LOGGER_ID": "-1001",
+    "STRING_SESSION": "benchmark",
+    "STRING_SESSION2": "benchmark",
+}
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# Read-only files the bot opens relative to its working directory
+SHARED = ["strings/langs", "ShrutixMusic/assets"]
+
+
+def _remove_workspace(path: str):
+    # Records logged while the interpreter shuts down must not reopen log.txt in it
+    root = logging.getLogger()
+    for handler in root.handlers[:]:
+        if isinstance(handler, logging.FileHandler) and handler.baseFilename.startswith(path):
+            root.removeHandler(handler)
+            handler.close()
+    shutil.rmtree(path, True)
+
+
+class Environment:
+    def __init__(self, assistants: int = 2, latency: float = 0, track_length: float = None):
+        self.latency = latency
+        self.assistants = assistants
+        self.track_length = track_length
+        self.bot = FakeBot(latency)
+        self.calls = {}
+
+    def workspace(self) -> str:
+        # The bot writes log.txt, cache/, downloads/ and strings/.cache into its
+        # working directory, so it runs from a scratch one instead of the checkout
+        from git import Repo
+
+        # Removed at exit rather than with this object, callers may drop it after prepare()
+        path = tempfile.mkdtemp(prefix="shrutix-benchmark-")
+        atexit.register(_remove_workspace, path)
+        for shared in SHARED:
+            os.makedirs(os.path.join(path, os.path.dirname(shared)), exist_ok=True)
+            os.symlink(os.path.join(ROOT, shared), os.path.join(path, shared))
+        # Outside a checkout core.git would fetch the upstream repository
+        Repo.init(path)
+        return path
+
+    def prepare(self):
+        os.chdir(self.workspace())
+        if ROOT not in sys.path:
+            sys.path.insert(0, ROOT)
+        for key, value in ENVIRONMENT.items():
+            os.environ.setdefault(key, value)
+        for num in range(3, self.assistants + 1):
+            os.environ.setdefault(f"STRING_SESSION{num}", "benchmark")
+
+        import motor.motor_asyncio
+
+        FakeMotorClient.latency = self.latency
+        motor.motor_asyncio.AsyncIOMotorClient = FakeMotorClient
+
+        import aiohttp
+
+        session = aiohttp.ClientSession
+        aiohttp.ClientSession = FakeSession
+        try:
+            import ShrutixMusic
+            from ShrutixMusic.core import userbot as userbot_module
+            from ShrutixMusic.core.call import Shruti
+            from ShrutixMusic.platforms import Youtube
+            from ShrutixMusic.utils import thumbnails
+        finally:
+            aiohttp.ClientSession = session
+
+        self.bot.install(ShrutixMusic.nand)
+        userbot = ShrutixMusic.userbot
+        for num in list(userbot.clients):
+            userbot.clients[num] = FakeAssistant(num)
+            self.calls[num] = FakeCalls(self.latency, self.track_length)
+        Shruti.pool = self.calls
+        userbot_module.assistants[:] = sorted(userbot.clients)
+        userbot_module.assistantids[:] = [
+            userbot.clients[num].id for num in userbot_module.assistants
+        ]
+
+        with open(thumbnails.FALLBACK_THUMB, "rb") as f:
+            FakeSession.body = f.read()
+        thumbnails.VideosSearch = FakeVideosSearch
+        thumbnails.aiohttp = type(sys)("aiohttp")
+        thumbnails.aiohttp.ClientSession = FakeSession
+        Youtube.VideosSearch = FakeVideosSearch
+        Youtube.download_song = FakeDownloader("mp3", self.latency)
+        Youtube.download_video = FakeDownloader("mp4", self.latency)
+        return self
@@ -0,0 +1,392 @@
+import asyncio
+import itertools
+import random
+import time
+
+_ids = itertools.count(1)
+
+
+class FakeResult:
+    def __init__(self, **fields):
+        self.__dict__.update(fields)
+
+
+class FakeCollection:
+    # Motor's collection API served by the embedded backend, with a simulated
+    # round trip per call and a count of the calls made
+    plain_requests = True
+
+    def __init__(self, collection, latency: float = 0):
+        self.collection = collection
+        self.name = collection.name
+        self.latency = latency
+        self.ops = 0
+
+    async def _io(self):
+        self.ops += 1
+        await asyncio.sleep(self.latency)
+
+    async def create_index(self, key: str, unique: bool = False):
+        await self._io()
+        return await self.collection.create_index(key, unique=unique)
+
+    async def find_one(self, query: dict = None, projection=None):
+        await self._io()
+        return await self.collection.find_one(query, projection)
+
+    def find(self, query: dict = None, projection=None):
+        self.ops += 1
+        return self.collection.find(query, projection)
+
+    async def count_documents(self, query: dict = None):
+        await self._io()
+        return await self.collection.count_documents(query or {})
+
+    async def insert_one(self, doc: dict):
+        await self._io()
+        return await self.collection.insert_one(doc)
+
+    async def update_one(self, query: dict, update: dict, upsert: bool = False):
+        await self._io()
+        return await self.collection.update_one(query, update, upsert=upsert)
+
+    async def bulk_write(self, requests: list, ordered: bool = True):
+        await self._io()
+        return await self.collection.bulk_write(requests, ordered=ordered)
+
+    async def delete_one(self, query: dict):
+        await self._io()
+        return await self.collection.delete_one(query)
+
+    async def delete_many(self, query: dict):
+        await self._io()
+        return await self.collection.delete_many(query)
+
+
+class FakeDatabase:
+    def __init__(self, latency: float = 0):
+        from ShrutixMusic.core.storage import EmbeddedDatabase
+
+        self.latency = latency
+        self.database = EmbeddedDatabase(":memory:")
+        self.collections = {}
+
+    def __getattr__(self, name: str) -> FakeCollection:
+        if name.startswith("__") or name in ("latency", "database", "collections"):
+            raise AttributeError(name)
+        if name not in self.collections:
+            self.collections[name] = FakeCollection(self.database[name], self.latency)
+        return self.collections[name]
+
+    __getitem__ = __getattr__
+
+    async def command(self, name: str):
+        return await self.database.command(name)
+
+
+class FakeMotorClient:
+    latency = 0
+
+    def __init__(self, *args, **kwargs):
+        self.databases = {}
+
+    def __getattr__(self, name: str) -> FakeDatabase:
+        if name.startswith("__"):
+            raise AttributeError(name)
+        if name not in self.databases:
+            self.databases[name] = FakeDatabase(self.latency)
+        return self.databases[name]
+
+    __getitem__ = __getattr__
+
+
+class FakeMessage:
+    def __init__(self, chat_id: int, text: str = None, **kwargs):
+        self.id = next(_ids)
+        self.chat = FakeResult(id=chat_id)
+        self.text = text
+        self.caption = kwargs.get("caption")
+        self.reply_markup = kwargs.get("reply_markup")
+
+    async def edit_text(self, text, **kwargs):
+        self.text = text
+        return self
+
+    edit = edit_text
+
+    async def edit_reply_markup(self, reply_markup=None):
+        self.reply_markup = reply_markup
+        return self
+
+    async def reply_text(self, text, **kwargs):
+        return FakeMessage(self.chat.id, text, **kwargs)
+
+    async def delete(self):
+        return True
+
+
+class FakeChat:
+    def __init__(self, chat_id: int):
+        from pyrogram.enums import ChatType
+
+        self.id = chat_id
+        self.type = ChatType.SUPERGROUP
+        self.title = f"Load Chat {chat_id}"
+        self.username = None
+
+
+class FakeUser:
+    def __init__(self, user_id: int):
+        self.id = user_id
+        self.first_name = f"User {user_id}"
+        self.username = None
+        self.mention = f"<a href='tg://user?id={user_id}'>{self.first_name}</a>"
+
+
+class FakeCommand(FakeMessage):
+    def __init__(self, bot, chat: FakeChat, user: FakeUser, text: str):
+        super().__init__(chat.id, text)
+        self.bot = bot
+        self.chat = chat
+        self.from_user = user
+        self.command = text.lstrip("/").split()
+        self.sender_chat = None
+        self.reply_to_message = None
+        self.entities = None
+        self.caption_entities = None
+        self.replied_at = None
+
+    def _replied(self):
+        if self.replied_at is None:
+            self.replied_at = time.perf_counter()
+
+    async def reply_text(self, text, **kwargs):
+        self._replied()
+        return await self.bot.send_message(self.chat.id, text, **kwargs)
+
+    async def reply_photo(self, photo, caption=None, **kwargs):
+        self._replied()
+        return await self.bot.send_photo(self.chat.id, photo, caption=caption, **kwargs)
+
+
+class FakeCallbackQuery:
+    def __init__(self, bot, chat: FakeChat, user: FakeUser, data: str):
+        self.id = str(next(_ids))
+        self.bot = bot
+        self.data = data
+        self.from_user = user
+        self.message = FakeMessage(chat.id)
+        self.message.chat = chat
+        self.replied_at = None
+
+    def _replied(self):
+        if self.replied_at is None:
+            self.replied_at = time.perf_counter()
+
+    async def answer(self, text=None, show_alert=None, **kwargs):
+        self._replied()
+        await asyncio.sleep(self.bot.latency)
+
+    async def edit_message_text(self, text, **kwargs):
+        self._replied()
+        await asyncio.sleep(self.bot.latency)
+
+    async def edit_message_reply_markup(self, reply_markup=None):
+        self._replied()
+        await asyncio.sleep(self.bot.latency)
+
+
+class FakeBot:
+    def __init__(self, latency: float = 0):
+        self.latency = latency
+        self.sent = 0
+        self.admins = {}
+
+    def install(self, client):
+        client.id = 1000
+        client.name = "Benchmark Bot"
+        client.username = "BenchmarkBot"
+        client.mention = "<a href='tg://user?id=1000'>Benchmark Bot</a>"
+        client.send_message = self.send_message
+        client.send_photo = self.send_photo
+        client.get_chat_member = self.get_chat_member
+        client.get_chat_members = self.get_chat_members
+
+    async def send_message(self, chat_id, text=None, **kwargs):
+        await asyncio.sleep(self.latency)
+        self.sent += 1
+        return FakeMessage(chat_id, text, **kwargs)
+
+    async def send_photo(self, chat_id, photo=None, caption=None, **kwargs):
+        await asyncio.sleep(self.latency)
+        self.sent += 1
+        return FakeMessage(chat_id, caption=caption, **kwargs)
+
+    async def get_chat_member(self, chat_id, user_id):
+        await asyncio.sleep(self.latency)
+        return FakeResult(status=None, user=FakeResult(id=user_id))
+
+    async def get_chat_members(self, chat_id, filter=None):
+        await asyncio.sleep(self.latency)
+        for user_id in self.admins.get(chat_id, []):
+            yield FakeResult(
+                user=FakeResult(id=user_id),
+                privileges=FakeResult(can_manage_video_chats=True),
+            )
+
+
+class FakeAssistant:
+    def __init__(self, num: int):
+        self.id = 2000 + num
+        self.name = f"Assistant {num}"
+        self.username = f"Assistant{num}"
+        self.mention = self.name
+
+    async def resolve_peer(self, peer):
+        return peer
+
+    async def join_chat(self, link):
+        return True
+
+
+class FakeCalls:
+    def __init__(self, latency: float = 0, track_length: float = None):
+        self.latency = latency
+        self.track_length = track_length
+        self.streams = {}
+        self.handlers = {}
+        self.timers = {}
+        self.ended = 0
+
+    async def _io(self):
+        await asyncio.sleep(self.latency)
+
+    async def start(self):
+        pass
+
+    @property
+    async def ping(self):
+        return round(random.uniform(1, 5), 3)
+
+    def _play(self, chat_id, stream):
+        self.streams[chat_id] = stream
+        self._stop(chat_id)
+        if self.track_length:
+            loop = asyncio.get_running_loop()
+            delay = random.uniform(0.5, 1.5) * self.track_length
+            self.timers[chat_id] = loop.call_later(delay, self._ended, chat_id)
+
+    def _stop(self, chat_id):
+        timer = self.timers.pop(chat_id, None)
+        if timer:
+            timer.cancel()
+
+    def _ended(self, chat_id):
+        from pytgcalls.types.stream import StreamAudioEnded
+
+        self.timers.pop(chat_id, None)
+        handler = self.handlers.get("on_stream_end")
+        if handler and chat_id in self.streams:
+            self.ended += 1
+            asyncio.create_task(handler(self, StreamAudioEnded(chat_id)))
+
+    async def join_group_call(self, chat_id, stream, stream_type=None):
+        await self._io()
+        self._play(chat_id, stream)
+
+    async def change_stream(self, chat_id, stream):
+        await self._io()
+        self._play(chat_id, stream)
+
+    async def leave_group_call(self, chat_id):
+        await self._io()
+        self._stop(chat_id)
+        self.streams.pop(chat_id, None)
+
+    async def pause_stream(self, chat_id):
+        await self._io()
+
+    async def resume_stream(self, chat_id):
+        await self._io()
+
+    async def get_participants(self, chat_id):
+        return [FakeResult(user_id=1), FakeResult(user_id=2)]
+
+    def _register(self, event):
+        def decorator(func):
+            self.handlers[event] = func
+            return func
+
+        return lambda: decorator
+
+    def __getattr__(self, name: str):
+        if name.startswith("on_"):
+            return self._register(name)
+        raise AttributeError(name)
+
+
+class FakeVideosSearch:
+    def __init__(self, query, limit=1):
+        self.query = query
+
+    async def next(self):
+        vidid = "dQw4w9WgXcQ" if "dQw4w9WgXcQ" in self.query else f"{abs(hash(self.query)):011d}"[:11]
+        return {
+            "result": [
+                {
+                    "id": vidid,
+                    "title": "Benchmark Track With A Reasonably Long Title For Wrapping",
+                    "duration": "3:33",
+                    "link": f"https://www.youtube.com/watch?v={vidid}",
+                    "thumbnails": [{"url": "https://i.ytimg.com/vi/dQw4w9WgXcQ/hq720.jpg"}],
+                    "viewCount": {"short": "1.2B views"},
+                    "channel": {"name": "Benchmark Channel"},
+                }
+            ]
+        }
+
+
+class FakeDownloader:
+    def __init__(self, extension: str, latency: float = 0):
+        self.extension = extension
+        self.latency = latency
+
+    async def __call__(self, link: str) -> str:
+        await asyncio.sleep(self.latency)
+        video_id = link.split("v=")[-1].split("&")[0]
+        return f"downloads/{video_id}.{self.extension}"
+
+
+class FakeResponse:
+    def __init__(self, body: bytes):
+        self.status = 200
+        self.body = body
+
+    async def read(self):
+        return self.body
+
+    async def text(self):
+        # Answers the API url lookup done when the YouTube platform is imported
+        return "http://127.0.0.1:9"
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        return False
+
+
+class FakeSession:
+    body = b""
+
+    def __init__(self, *args, **kwargs):
+        pass
+
+    def get(self, url, **kwargs):
+        return FakeResponse(self.body)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        return False
@@ -0,0 +1,204 @@
+import argparse
+import asyncio
+import os
+import random
+import sys
+import time
+
+from benchmarks.env import Environment
+from benchmarks.fakes import FakeCallbackQuery, FakeChat, FakeCommand, FakeUser
+
+# Relative weight of each simulated action
+ACTIONS = {"play": 4, "queue": 2, "callback": 2, "skip": 1, "seek": 1}
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks.load",
+        description="Drive the real /play, /skip, /queue, /seek and ADMIN callback handlers from many simulated groups.",
+    )
+    parser.add_argument("--chats", type=int, default=50, help="number of simulated groups")
+    parser.add_argument("--rate", type=float, default=0.2, help="actions per second issued by each group")
+    parser.add_argument("--duration", type=float, default=60, help="length of the run in seconds")
+    parser.add_argument("--track-length", type=float, default=30, help="mean seconds before a fake assistant ends a track")
+    parser.add_argument("--latency", type=float, default=0.02, help="simulated latency of every Telegram/Mongo call, in seconds")
+    parser.add_argument("--assistants", type=int, default=2, help="number of fake assistants")
+    parser.add_argument("--workers", type=int, default=min(32, (os.cpu_count() or 0) + 4), help="update workers, like pyrogram's")
+    return parser.parse_args()
+
+
+def _percentile(samples: list, pct: float) -> float:
+    if not samples:
+        return 0.0
+    samples = sorted(samples)
+    return samples[min(int(len(samples) * pct / 100), len(samples) - 1)]
+
+
+def _deep_size(obj, seen=None) -> int:
+    seen = seen if seen is not None else set()
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(_deep_size(k, seen) + _deep_size(v, seen) for k, v in obj.items())
+    elif isinstance(obj, (list, tuple, set)):
+        size += sum(_deep_size(item, seen) for item in obj)
+    return size
+
+
+class Stats:
+    def __init__(self):
+        self.issued = {action: 0 for action in ACTIONS}
+        self.done = {action: 0 for action in ACTIONS}
+        self.errors = {action: 0 for action in ACTIONS}
+        self.reply = {action: [] for action in ACTIONS}
+        self.handler = {action: [] for action in ACTIONS}
+        self.queue_bytes = 0
+        self.queue_tracks = 0
+        self.backlog = 0
+
+
+class LoadTest:
+    def __init__(self, args, environment: Environment):
+        self.args = args
+        self.environment = environment
+        self.stats = Stats()
+        self.updates = asyncio.Queue()
+        self.running = True
+
+    def handlers(self):
+        from ShrutixMusic.plugins.admins.callback import del_back_playlist
+        from ShrutixMusic.plugins.admins.seek import seek_comm
+        from ShrutixMusic.plugins.admins.skip import skip
+        from ShrutixMusic.plugins.play.play import play_commnd
+        from ShrutixMusic.plugins.tools.queue import get_queue
+
+        return {
+            "play": play_commnd,
+            "queue": get_queue,
+            "callback": del_back_playlist,
+            "skip": skip,
+            "seek": seek_comm,
+        }
+
+    def update(self, action: str, chat: FakeChat, user: FakeUser, count: int):
+        bot = self.environment.bot
+        if action == "play":
+            return FakeCommand(bot, chat, user, f"/play load test {chat.id} {count}")
+        if action == "queue":
+            return FakeCommand(bot, chat, user, "/queue")
+        if action == "skip":
+            return FakeCommand(bot, chat, user, "/skip")
+        if action == "seek":
+            return FakeCommand(bot, chat, user, "/seek 10")
+        command = random.choice(["Pause", "Resume"])
+        return FakeCallbackQuery(bot, chat, user, f"ADMIN {command}|{chat.id}")
+
+    async def group(self, index: int):
+        from config import adminlist
+
+        chat = FakeChat(-1009000000000 - index)
+        user = FakeUser(5000 + index)
+        adminlist[chat.id] = [user.id]
+        self.environment.bot.admins[chat.id] = [user.id]
+        actions, weights = zip(*ACTIONS.items())
+        count = 0
+        action = "play"
+        await asyncio.sleep(random.uniform(0, 1 / self.args.rate))
+        while self.running:
+            count += 1
+            self.stats.issued[action] += 1
+            await self.updates.put((action, self.update(action, chat, user, count), time.perf_counter()))
+            await asyncio.sleep(random.expovariate(self.args.rate))
+            action = random.choices(actions, weights)[0]
+
+    async def worker(self, handlers: dict):
+        from ShrutixMusic import nand
+
+        while True:
+            action, update, queued = await self.updates.get()
+            try:
+                await handlers[action](nand, update)
+                self.stats.done[action] += 1
+            except Exception:
+                self.stats.errors[action] += 1
+            finally:
+                self.stats.handler[action].append(time.perf_counter() - queued)
+                if update.replied_at:
+                    self.stats.reply[action].append(update.replied_at - queued)
+
+    async def sampler(self):
+        from ShrutixMusic.misc import db
+
+        while self.running:
+            await asyncio.sleep(1)
+            self.stats.queue_bytes = max(self.stats.queue_bytes, _deep_size(db))
+            self.stats.queue_tracks = max(
+                self.stats.queue_tracks, sum(len(queue) for queue in db.values())
+            )
+            self.stats.backlog = max(self.stats.backlog, self.updates.qsize())
+
+    async def run(self):
+        from ShrutixMusic.core.call import Shruti
+        from ShrutixMusic.core.monitor import monitor
+        from ShrutixMusic.core.supervisor import supervisor
+
+        handlers = self.handlers()
+        await Shruti.decorators()
+        monitor.start()
+        supervisor.start()
+        workers = [asyncio.create_task(self.worker(handlers)) for _ in range(self.args.workers)]
+        groups = [asyncio.create_task(self.group(i)) for i in range(self.args.chats)]
+        sampler = asyncio.create_task(self.sampler())
+        started = time.perf_counter()
+        await asyncio.sleep(self.args.duration)
+        self.running = False
+        elapsed = time.perf_counter() - started
+        for task in [*groups, *workers, sampler]:
+            task.cancel()
+        await supervisor.stop()
+        return elapsed, monitor
+
+    def report(self, elapsed: float, monitor) -> str:
+        from ShrutixMusic.utils.database import active
+
+        stats = self.stats
+        done = sum(stats.done.values())
+        lines = [
+            f"{self.args.chats} chats, {self.args.rate}/s each, {self.args.workers} workers, "
+            f"{self.args.latency * 1000:.0f}ms fake latency, {elapsed:.0f}s",
+            "",
+            f"{'action':<10}{'issued':>8}{'done':>8}{'errors':>8}{'reply p50':>11}{'reply p95':>11}{'reply p99':>11}{'handler p95':>13}",
+        ]
+        for action in ACTIONS:
+            reply = stats.reply[action]
+            lines.append(
+                f"{action:<10}{stats.issued[action]:>8}{stats.done[action]:>8}{stats.errors[action]:>8}"
+                f"{_percentile(reply, 50) * 1000:>9.0f}ms{_percentile(reply, 95) * 1000:>9.0f}ms"
+                f"{_percentile(reply, 99) * 1000:>9.0f}ms{_percentile(stats.handler[action], 95) * 1000:>11.0f}ms"
+            )
+        ended = sum(calls.ended for calls in self.environment.calls.values())
+        lines += [
+            "",
+            f"throughput      : {done / elapsed:.1f} handled updates/s",
+            f"update backlog  : {stats.backlog} at most, {self.updates.qsize()} left",
+            f"active calls    : {len(active)} at the end, {ended} tracks ended",
+            f"queue memory    : {stats.queue_bytes / 1024:.0f} KiB for {stats.queue_tracks} tracks at most",
+            f"loop lag        : {monitor.summary()}",
+        ]
+        return "\n".join(lines)
+
+
+def main() -> int:
+    args = parse_args()
+    environment = Environment(args.assistants, args.latency, args.track_length).prepare()
+    test = LoadTest(args, environment)
+    loop = asyncio.get_event_loop()
+    elapsed, monitor = loop.run_until_complete(test.run())
+    print(test.report(elapsed, monitor))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
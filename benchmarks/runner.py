@@ -0,0 +1,93 @@
+import json
+import time
+
+benchmarks = {}
+
+
+class Benchmark:
+    def __init__(self, name: str, func, iterations: int, warmup: int, setup=None):
+        self.name = name
+        self.func = func
+        self.iterations = iterations
+        self.warmup = warmup
+        self.setup = setup
+
+
+def benchmark(name: str, iterations: int = 1000, warmup: int = 50, setup=None):
+    def decorator(func):
+        benchmarks[name] = Benchmark(name, func, iterations, warmup, setup)
+        return func
+
+    return decorator
+
+
+def _percentile(samples: list, pct: float) -> float:
+    return samples[min(int(len(samples) * pct / 100), len(samples) - 1)]
+
+
+async def measure(bench: Benchmark) -> dict:
+    if bench.setup:
+        await bench.setup()
+    for i in range(bench.warmup):
+        await bench.func(i)
+    samples = []
+    start = time.perf_counter()
+    for i in range(bench.iterations):
+        began = time.perf_counter()
+        await bench.func(i)
+        samples.append(time.perf_counter() - began)
+    total = time.perf_counter() - start
+    samples.sort()
+    return {
+        "iterations": bench.iterations,
+        "ops": bench.iterations / total,
+        "p50": _percentile(samples, 50) * 1000,
+        "p95": _percentile(samples, 95) * 1000,
+        "p99": _percentile(samples, 99) * 1000,
+        "max": samples[-1] * 1000,
+    }
+
+
+def load_baseline(path: str) -> dict:
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+
+
+def save_baseline(path: str, results: dict):
+    with open(path, "w") as f:
+        json.dump(results, f, indent=2, sort_keys=True)
+        f.write("\n")
+
+
+def compare(results: dict, baseline: dict, tolerance: float) -> list:
+    regressions = []
+    for name, result in results.items():
+        base = baseline.get(name)
+        if not base:
+            continue
+        if result["ops"] < base["ops"] * (1 - tolerance):
+            regressions.append(
+                f"{name}: {result['ops']:.0f} ops/s, baseline {base['ops']:.0f} ops/s"
+            )
+        elif result["p95"] > base["p95"] * (1 + tolerance):
+            regressions.append(
+                f"{name}: p95 {result['p95']:.3f}ms, baseline {base['p95']:.3f}ms"
+            )
+    return regressions
+
+
+def table(results: dict, baseline: dict) -> str:
+    lines = [
+        f"{'benchmark':<28}{'ops/s':>12}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'max ms':>10}{'vs base':>10}"
+    ]
+    for name, result in results.items():
+        base = baseline.get(name)
+        change = f"{(result['ops'] / base['ops'] - 1) * 100:+.1f}%" if base else "-"
+        lines.append(
+            f"{name:<28}{result['ops']:>12.0f}{result['p50']:>10.3f}{result['p95']:>10.3f}"
+            f"{result['p99']:>10.3f}{result['max']:>10.3f}{change:>10}"
+        )
+    return "\n".join(lines)
@@ -0,0 +1,131 @@
+from benchmarks.runner import benchmark
+from ShrutixMusic.core.call import Shruti
+from ShrutixMusic.misc import db
+from ShrutixMusic.utils.database import (
+    add_served_chat,
+    chatsdb,
+    get_lang,
+    get_loop,
+    get_served_chats,
+    is_active_chat,
+    is_served_chat,
+)
+from ShrutixMusic.utils.inline.play import stream_markup, stream_markup_timer, track_markup
+from ShrutixMusic.utils.inline.queue import queue_markup
+from ShrutixMusic.utils.stream.queue import put_queue
+from ShrutixMusic.utils.thumbnails import get_thumb
+from config import autoclean
+from strings import get_string
+
+CHATS = 100
+_ = get_string("en")
+
+
+def _chat(i: int) -> int:
+    return -1001000000000 - (i % CHATS)
+
+
+def _track(chat_id: int, i: int) -> dict:
+    return {
+        "title": f"Benchmark Track {i}",
+        "dur": "3:33",
+        "streamtype": "audio",
+        "by": "Benchmark User",
+        "user_id": 1,
+        "chat_id": chat_id,
+        "file": f"downloads/benchmark_{i}.mp3",
+        "vidid": "telegram",
+        "seconds": 210,
+        "played": 0,
+    }
+
+
+@benchmark("put_queue", iterations=20000)
+async def bench_put_queue(i):
+    chat_id = _chat(i)
+    if len(db.get(chat_id, [])) >= 50:
+        db[chat_id] = []
+        autoclean.clear()
+    db.setdefault(chat_id, [])
+    await put_queue(
+        chat_id,
+        chat_id,
+        f"downloads/benchmark_{i}.mp3",
+        "benchmark track",
+        "3:33",
+        "Benchmark User",
+        "telegram",
+        1,
+        "audio",
+    )
+
+
+@benchmark("change_stream", iterations=5000)
+async def bench_change_stream(i):
+    chat_id = _chat(i)
+    queue = db.setdefault(chat_id, [])
+    while len(queue) < 2:
+        queue.append(_track(chat_id, i))
+    await Shruti.change_stream(Shruti.pool[1], chat_id)
+
+
+@benchmark("get_thumb", iterations=20, warmup=2)
+async def bench_get_thumb(i):
+    await get_thumb("dQw4w9WgXcQ")
+
+
+@benchmark("get_lang", iterations=20000)
+async def bench_get_lang(i):
+    await get_lang(_chat(i))
+
+
+@benchmark("get_loop", iterations=20000)
+async def bench_get_loop(i):
+    await get_loop(_chat(i))
+
+
+@benchmark("is_active_chat", iterations=20000)
+async def bench_is_active_chat(i):
+    await is_active_chat(_chat(i))
+
+
+@benchmark("add_served_chat", iterations=2000)
+async def bench_add_served_chat(i):
+    await add_served_chat(-1002000000000 - i)
+
+
+@benchmark("is_served_chat", iterations=2000)
+async def bench_is_served_chat(i):
+    await is_served_chat(_chat(i))
+
+
+async def _served_chats():
+    await chatsdb.delete_many({})
+    await chatsdb.bulk_write(
+        [({"chat_id": -1003000000000 - i}, {"$set": {"chat_id": -1003000000000 - i}}, True) for i in range(5000)]
+    )
+
+
+@benchmark("get_served_chats", iterations=50, warmup=2, setup=_served_chats)
+async def bench_get_served_chats(i):
+    await get_served_chats()
+
+
+@benchmark("stream_markup", iterations=20000)
+async def bench_stream_markup(i):
+    stream_markup(_, _chat(i))
+
+
+@benchmark("stream_markup_timer", iterations=20000)
+async def bench_stream_markup_timer(i):
+    stream_markup_timer(_, _chat(i), "1:23", "3:33")
+
+
+@benchmark("track_markup", iterations=20000)
+async def bench_track_markup(i):
+    track_markup(_, "dQw4w9WgXcQ", 1, "g", "f")
+
+
+@benchmark("queue_markup", iterations=20000)
+async def bench_queue_markup(i):
+    queue_markup(_, "3:33", "g", "dQw4w9WgXcQ", "1:23", "3:33")
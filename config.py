@@ -1,5 +1,5 @@
 import re
-from os import getenv
+from os import environ, getenv
 
 from dotenv import load_dotenv
 from pyrogram import filters
@@ -16,6 +16,10 @@ BOT_TOKEN = getenv("BOT_TOKEN")
 # Get your mongo url from cloud.mongodb.com
 MONGO_DB_URI = getenv("MONGO_DB_URI")
 
+# Set this to sqlite to keep the data in a local file at STORAGE_PATH instead of Mongo (":memory:" keeps nothing)
+STORAGE = getenv("STORAGE", "mongo").lower()
+STORAGE_PATH = getenv("STORAGE_PATH", "ShrutixMusic.db")
+
 DURATION_LIMIT_MIN = int(getenv("DURATION_LIMIT", 1700))
 
 # Chat id of a group for logging bot's activities
@@ -45,6 +49,31 @@ SUPPORT_CHAT = getenv("SUPPORT_CHAT", "https://t.me/Venompratapchat")
 # Set this to True if you want the assistant to automatically leave chats after an interval
 AUTO_LEAVING_ASSISTANT = bool(getenv("AUTO_LEAVING_ASSISTANT", False))
 
+# Set this to True to load non-default languages only when a chat first uses them
+LAZY_LANGUAGES = bool(getenv("LAZY_LANGUAGES", False))
+
+# Event loop stalls longer than this many seconds are logged with the blocking stack
+SLOW_CALLBACK_THRESHOLD = float(getenv("SLOW_CALLBACK_THRESHOLD", 0.25))
+
+# Mongo commands slower than this many seconds are logged with their collection and filter keys
+SLOW_QUERY_THRESHOLD = float(getenv("SLOW_QUERY_THRESHOLD", 0.2))
+
+# Set this to True to log how long each startup phase took
+STARTUP_PROFILE = bool(getenv("STARTUP_PROFILE", False))
+
+# Set this to True if idle chats should be moved to a less loaded assistant on their next play
+ASSISTANT_REBALANCE = bool(getenv("ASSISTANT_REBALANCE", False))
+
+# Path of a file to append /play latency traces to as JSON lines, leave empty to keep them in memory only
+TRACE_FILE = getenv("TRACE_FILE", None)
+
+# Set a port to serve Prometheus metrics on http://METRICS_HOST:METRICS_PORT/metrics, 0 keeps it off
+METRICS_PORT = int(getenv("METRICS_PORT", 0))
+METRICS_HOST = getenv("METRICS_HOST", "127.0.0.1")
+
+# Seconds between re-reads of the global on/off flags, set this when several instances share one database
+FLAG_RECONCILE_INTERVAL = int(getenv("FLAG_RECONCILE_INTERVAL", 0))
+
 
 # Get this credentials from https://developer.spotify.com/dashboard
 SPOTIFY_CLIENT_ID = getenv("SPOTIFY_CLIENT_ID", None)
@@ -62,17 +91,21 @@ TG_VIDEO_FILESIZE_LIMIT = int(getenv("TG_VIDEO_FILESIZE_LIMIT", 1073741824))
 
 
 # Get your pyrogram v2 session from @StringFatherBot on Telegram
-STRING1 = getenv("STRING_SESSION", None)
-STRING2 = getenv("STRING_SESSION2", None)
-STRING3 = getenv("STRING_SESSION3", None)
-STRING4 = getenv("STRING_SESSION4", None)
-STRING5 = getenv("STRING_SESSION5", None)
+# STRING_SESSION is assistant 1, STRING_SESSION2 is assistant 2 and so on, there is no upper limit.
+STRING_SESSIONS = dict(
+    sorted(
+        (int(key[len("STRING_SESSION") :] or 1), value)
+        for key, value in environ.items()
+        if re.fullmatch(r"STRING_SESSION\d*", key) and value
+    )
+)
 
 
 BANNED_USERS = filters.user()
 adminlist = {}
 lyrical = {}
 votemode = {}
+upvoters = {}
 autoclean = []
 confirmer = {}
 
@@ -1,34 +1,82 @@
 import os
+import pickle
 from typing import List
 
 import yaml
 
+import config
+from ShrutixMusic.core.profiler import profile
+
 languages = {}
 languages_present = {}
+compiled = {}
+
+LANGS_DIR = r"./strings/langs/"
+CACHE_FILE = r"./strings/.cache"
 
 
 def get_string(lang: str):
+    if lang not in languages:
+        languages[lang] = pickle.loads(compiled[lang])
     return languages[lang]
 
 
-for filename in os.listdir(r"./strings/langs/"):
-    if "en" not in languages:
-        languages["en"] = yaml.safe_load(
-            open(r"./strings/langs/en.yml", encoding="utf8")
-        )
-        languages_present["en"] = languages["en"]["name"]
-    if filename.endswith(".yml"):
+def _signature() -> List[tuple]:
+    signature = []
+    for filename in sorted(os.listdir(LANGS_DIR)):
+        if filename.endswith(".yml"):
+            stat = os.stat(LANGS_DIR + filename)
+            signature.append((filename, stat.st_mtime_ns, stat.st_size))
+    return signature
+
+
+def _compile(signature: List[tuple]) -> dict:
+    english = yaml.safe_load(open(LANGS_DIR + "en.yml", encoding="utf8"))
+    present = {"en": english["name"]}
+    strings = {}
+    for filename, _, _ in signature:
         language_name = filename[:-4]
         if language_name == "en":
-            continue
-        languages[language_name] = yaml.safe_load(
-            open(r"./strings/langs/" + filename, encoding="utf8")
-        )
-        for item in languages["en"]:
-            if item not in languages[language_name]:
-                languages[language_name][item] = languages["en"][item]
+            language = english
+        else:
+            language = yaml.safe_load(open(LANGS_DIR + filename, encoding="utf8"))
+            for item in english:
+                if item not in language:
+                    language[item] = english[item]
+        try:
+            present[language_name] = language["name"]
+        except:
+            print("There is some issue with the language file inside bot.")
+            exit()
+        strings[language_name] = pickle.dumps(language, pickle.HIGHEST_PROTOCOL)
+    return {"signature": signature, "present": present, "strings": strings}
+
+
+def _load() -> dict:
+    signature = _signature()
+    try:
+        with open(CACHE_FILE, "rb") as f:
+            cache = pickle.load(f)
+        if cache["signature"] == signature:
+            return cache
+    except Exception:
+        pass
+    cache = _compile(signature)
     try:
-        languages_present[language_name] = languages[language_name]["name"]
-    except:
-        print("There is some issue with the language file inside bot.")
-        exit()
+        with open(CACHE_FILE + ".tmp", "wb") as f:
+            pickle.dump(cache, f, pickle.HIGHEST_PROTOCOL)
+        os.replace(CACHE_FILE + ".tmp", CACHE_FILE)
+    except OSError:
+        pass
+    return cache
+
+
+# Loaded while ShrutixMusic imports its platforms, so this phase overlaps "platforms import"
+with profile("strings"):
+    _cache = _load()
+    languages_present.update(_cache["present"])
+    compiled.update(_cache["strings"])
+    get_string("en")
+    if not config.LAZY_LANGUAGES:
+        for language_name in compiled:
+            get_string(language_name)
@@ -93,6 +93,10 @@ HELP_9 = """
 <u><b>ᴍᴀɪɴᴛᴇɴᴀɴᴄᴇ ᴍᴏᴅᴇ</b></u> [ᴏɴʟʏ ғᴏʀ sᴜᴅᴏᴇʀs] :
 
 /logs : ɢᴇᴛ ʟᴏɢs ᴏғ ᴛʜᴇ ʙᴏᴛ.
+/profile [ᴄᴘᴜ/ᴍᴇᴍ/ᴀʟʟ] [sᴇᴄᴏɴᴅs] : ᴘʀᴏғɪʟᴇ ᴛʜᴇ ʀᴜɴɴɪɴɢ ʙᴏᴛ ᴀɴᴅ ɢᴇᴛ ᴛʜᴇ ʀᴇᴘᴏʀᴛ ᴀs ᴀ ғɪʟᴇ.
+
+/jobs [ᴘᴀᴜsᴇ/ʀᴇsᴜᴍᴇ] [ɴᴀᴍᴇ] : ʟɪsᴛ ʙᴀᴄᴋɢʀᴏᴜɴᴅ ᴊᴏʙs ᴡɪᴛʜ ᴛʜᴇɪʀ ʀᴜɴ ᴛɪᴍᴇs, ᴏʀ ᴘᴀᴜsᴇ/ʀᴇsᴜᴍᴇ ᴏɴᴇ ᴏғ ᴛʜᴇᴍ.
+/traces [ᴇxᴘᴏʀᴛ] : sʜᴏᴡ ʜᴏᴡ ʟᴏɴɢ ᴇᴀᴄʜ sᴛᴀɢᴇ ᴏғ /play ᴛᴀᴋᴇs, ᴏʀ ɢᴇᴛ ᴛʜᴇ ʀᴇᴄᴇɴᴛ ᴛʀᴀᴄᴇs ᴀs ᴊsᴏɴ ʟɪɴᴇs.
 
 /logger [ᴇɴᴀʙʟᴇ/ᴅɪsᴀʙʟᴇ] : ʙᴏᴛ ᴡɪʟʟ sᴛᴀʀᴛ ʟᴏɢɢɪɴɢ ᴛʜᴇ ᴀᴄᴛɪᴠɪᴛɪᴇs ʜᴀᴩᴩᴇɴ ᴏɴ ʙᴏᴛ.
 
@@ -0,0 +1,48 @@
+import asyncio
+import importlib
+from collections import OrderedDict
+
+import pytest
+
+from benchmarks.fakes import FakeCollection
+
+
+@pytest.fixture(scope="session")
+def environment():
+    from benchmarks.env import Environment
+
+    try:
+        return Environment().prepare()
+    except ImportError as e:
+        pytest.skip(f"the bot's dependencies are not installed : {e}")
+
+
+@pytest.fixture(scope="session")
+def loop():
+    loop = asyncio.new_event_loop()
+    yield loop
+    loop.close()
+
+
+@pytest.fixture
+def run(loop):
+    return loop.run_until_complete
+
+
+@pytest.fixture
+def database(environment, monkeypatch):
+    database = importlib.import_module("ShrutixMusic.utils.database")
+    # Every test starts with empty caches and an empty write buffer
+    for value in vars(database).values():
+        if isinstance(value, database.ReadThrough):
+            monkeypatch.setattr(value, "values", OrderedDict())
+    monkeypatch.setattr(database.writer, "pending", {})
+    return database
+
+
+def collections(database) -> list:
+    return [value for value in vars(database).values() if isinstance(value, FakeCollection)]
+
+
+def operations(database) -> int:
+    return sum(collection.ops for collection in collections(database))
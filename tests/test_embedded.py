@@ -0,0 +1,140 @@
+import asyncio
+import sqlite3
+from collections import OrderedDict
+
+import pytest
+from pymongo.errors import BulkWriteError, DuplicateKeyError, OperationFailure
+
+from tests.conftest import collections
+
+
+@pytest.fixture
+def embedded(database, monkeypatch):
+    from ShrutixMusic.core.storage import EmbeddedClient
+
+    client = EmbeddedClient(":memory:")
+    for name, value in vars(database).items():
+        if value in collections(database):
+            monkeypatch.setattr(database, name, client.ShrutiBots[value.name])
+    for name in ("MIGRATED_FIELDS", "MIGRATED_FLAGS"):
+        old = getattr(database, name)
+        monkeypatch.setattr(
+            database, name, [(client.ShrutiBots[c.name], *rest) for c, *rest in old]
+        )
+    monkeypatch.setattr(database, "counts", {})
+    return client.ShrutiBots
+
+
+def reload(database, embedded, run):
+    from ShrutixMusic.core.storage import EmbeddedCollection
+
+    # Drop what the helpers cached and reread every document from SQLite
+    run(database.writer.flush())
+    for value in vars(database).values():
+        if isinstance(value, database.ReadThrough):
+            value.values = OrderedDict()
+    for name in list(embedded.collections):
+        del embedded.collections[name]
+    for name, value in vars(database).items():
+        if isinstance(value, EmbeddedCollection):
+            setattr(database, name, embedded[value.name])
+
+
+def test_chat_settings_are_stored(database, embedded, run):
+    chat_id = -1005000000001
+    run(database.set_upvotes(chat_id, 7))
+    run(database.set_cmode(chat_id, -1005000000002))
+    run(database.skip_on(chat_id))
+    run(database.add_nonadmin_chat(chat_id))
+    reload(database, embedded, run)
+    assert run(database.get_upvote_count(chat_id)) == 7
+    assert run(database.get_cmode(chat_id)) == -1005000000002
+    assert run(database.is_skipmode(chat_id)) is True
+    assert run(database.is_nonadmin_chat(chat_id)) is True
+
+
+def test_served_ids_are_stored(database, embedded, run):
+    for user_id in (1, 2, 3):
+        run(database.add_served_user(user_id))
+    run(database.add_served_chat(-1005000000001))
+    reload(database, embedded, run)
+    assert run(database.get_served_users_count()) == 3
+    assert run(database.is_served_user(2)) is True
+    assert run(database.is_served_user(4)) is False
+    assert run(database.get_served_chats()) == [{"chat_id": -1005000000001}]
+
+
+def test_gban_round_trip(database, embedded, run):
+    run(database.add_gban_user(5))
+    run(database.add_gban_user(5))
+    assert run(database.get_gbanned()) == [5]
+    run(database.remove_gban_user(5))
+    assert run(database.is_gbanned_user(5)) is False
+
+
+def test_migration_merges_old_collections(database, embedded, run):
+    chat_id = -1005000000001
+    run(database.countdb.insert_one({"chat_id": chat_id, "mode": 9}))
+    run(database.authdb.insert_one({"chat_id": chat_id}))
+    assert run(database.migrate_chat_settings()) == 1
+    assert run(database.migrate_chat_settings()) == 0
+    assert run(database.get_upvote_count(chat_id)) == 9
+    assert run(database.is_nonadmin_chat(chat_id)) is True
+
+
+def test_unique_index_rejects_duplicates(embedded, run):
+    collection = embedded.uniques
+    run(collection.create_index("user_id", unique=True))
+    run(collection.insert_one({"user_id": 1}))
+    with pytest.raises(DuplicateKeyError):
+        run(collection.insert_one({"user_id": 1}))
+    requests = [
+        ({"user_id": 2}, {"$set": {"user_id": 2}}, True),
+        ({"name": "x"}, {"$set": {"user_id": 1}}, True),
+    ]
+    with pytest.raises(BulkWriteError) as error:
+        run(collection.bulk_write(requests, ordered=False))
+    assert [e["index"] for e in error.value.details["writeErrors"]] == [1]
+    assert run(collection.count_documents({})) == 2
+
+
+def test_unique_index_on_duplicates_fails_like_mongo(embedded, run):
+    collection = embedded.duplicated
+    run(collection.insert_one({"user_id": 1}))
+    run(collection.insert_one({"user_id": 1}))
+    with pytest.raises(OperationFailure) as error:
+        run(collection.create_index("user_id", unique=True))
+    assert error.value.code == 11000
+    run(collection.insert_one({"user_id": 1}))
+
+
+def test_concurrent_writes_share_one_transaction(embedded, run, monkeypatch):
+    transactions = []
+    write = embedded._write
+    monkeypatch.setattr(embedded, "_write", lambda changes: transactions.append(write(changes)))
+
+    async def writes():
+        await asyncio.gather(*(embedded.batched.insert_one({"n": n}) for n in range(10)))
+
+    run(writes())
+    assert len(transactions) == 1
+    assert len(embedded._rows("batched")) == 10
+
+
+def test_failed_transaction_is_rolled_back_in_memory(embedded, run, monkeypatch):
+    collection = embedded.rolled
+    run(collection.insert_one({"_id": "kept", "value": 1}))
+
+    def fail(changes):
+        raise sqlite3.OperationalError("disk I/O error")
+
+    with monkeypatch.context() as m:
+        m.setattr(embedded, "_write", fail)
+        with pytest.raises(sqlite3.OperationalError):
+            run(collection.update_one({"_id": "kept"}, {"$set": {"value": 2}}))
+        with pytest.raises(sqlite3.OperationalError):
+            run(collection.insert_one({"_id": "lost"}))
+    assert run(collection.find_one({"_id": "kept"}))["value"] == 1
+    assert run(collection.find_one({"_id": "lost"})) is None
+    run(collection.insert_one({"_id": "lost"}))
+    assert len(embedded._rows("rolled")) == 2
@@ -0,0 +1,62 @@
+import pytest
+
+from tests.conftest import operations
+
+GETTERS = [
+    ("get_upvote_count", "upvotes", 0),
+    ("get_cmode", "cmode", None),
+    ("is_skipmode", "skipmode", False),
+    ("is_nonadmin_chat", "nonadmin", False),
+]
+
+
+@pytest.mark.parametrize("getter, field, value", GETTERS)
+def test_unset_setting_is_read_once(database, run, getter, field, value):
+    chat_id = -1004000000001
+    first = run(getattr(database, getter)(chat_id))
+    before = operations(database)
+    assert run(getattr(database, getter)(chat_id)) == first
+    assert operations(database) == before
+
+
+@pytest.mark.parametrize("getter, field, value", GETTERS)
+def test_falsy_setting_is_read_once(database, run, getter, field, value):
+    chat_id = -1004000000100 - [name for name, _, _ in GETTERS].index(getter)
+    run(database.chatsettingsdb.insert_one({"chat_id": chat_id, field: value}))
+    assert run(getattr(database, getter)(chat_id)) == value
+    before = operations(database)
+    assert run(getattr(database, getter)(chat_id)) == value
+    assert operations(database) == before
+
+
+def test_concurrent_misses_share_one_load(database, run):
+    import asyncio
+
+    chat_id = -1004000000003
+    before = operations(database)
+
+    async def many():
+        return await asyncio.gather(*(database.is_skipmode(chat_id) for _ in range(10)))
+
+    assert run(many()) == [True] * 10
+    assert operations(database) == before + 1
+
+
+def test_served_cache_is_bounded(database, run, monkeypatch):
+    served = database.ReadThrough(database._load_served_chat, size=3)
+    for chat_id in range(-10, -4):
+        served.set(chat_id, True)
+    assert list(served.values) == [-7, -6, -5]
+    run(served.get(-7))
+    served.set(-4, True)
+    assert list(served.values) == [-5, -7, -4]
+
+
+def test_auth_users_survive_a_cache_reload(database, run):
+    chat_id = -1004000000200
+    run(database.save_authuser(chat_id, "alice", {"auth_user_id": 1}))
+    run(database.save_authuser(chat_id, "bob", {"auth_user_id": 2}))
+    run(database.delete_authuser(chat_id, "alice"))
+    database.authusers.values.clear()
+    assert run(database.get_authuser_names(chat_id)) == ["bob"]
+    assert run(database.get_authuser(chat_id, "bob")) == {"auth_user_id": 2}
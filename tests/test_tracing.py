@@ -0,0 +1,23 @@
+import json
+
+
+def test_traces_are_written_off_the_loop(environment, run, tmp_path, monkeypatch):
+    import config
+    from ShrutixMusic.core.tracing import Tracer
+
+    path = tmp_path / "traces.jsonl"
+    monkeypatch.setattr(config, "TRACE_FILE", str(path))
+    tracer = Tracer()
+
+    async def play():
+        for chat_id in (1, 2, 3):
+            with tracer.trace("play", chat_id=chat_id):
+                pass
+        # Nothing is written until the writer task gets to run
+        assert not path.exists()
+        await tracer.writer
+
+    run(play())
+    records = [json.loads(line) for line in path.read_text().splitlines()]
+    assert [record["chat_id"] for record in records] == [1, 2, 3]
+    assert tracer.writer is None
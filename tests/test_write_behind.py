@@ -0,0 +1,68 @@
+from pymongo.errors import AutoReconnect, BulkWriteError
+
+
+class FailingCollection:
+    name = "failing"
+    plain_requests = True
+
+    def __init__(self, failing=(), down=False):
+        # chat ids whose write fails on its own, every other write succeeds
+        self.failing = set(failing)
+        self.down = down
+        self.stored = []
+        self.batches = 0
+
+    async def bulk_write(self, requests: list, ordered: bool = True):
+        self.batches += 1
+        if self.down:
+            raise AutoReconnect("connection refused")
+        errors = []
+        for index, (query, _, _) in enumerate(requests):
+            chat_id = query["chat_id"]
+            if chat_id in self.failing:
+                errors.append({"index": index, "code": 11000, "errmsg": "E11000 duplicate key"})
+            else:
+                self.stored.append(chat_id)
+        if errors:
+            raise BulkWriteError({"writeErrors": errors, "nInserted": 0})
+
+
+def test_only_failed_writes_are_retried(environment, run):
+    from ShrutixMusic.core.writebehind import WriteBehind
+
+    writer = WriteBehind()
+    collection = FailingCollection(failing={2})
+    for chat_id in (1, 2, 3):
+        writer.upsert(collection, {"chat_id": chat_id}, {"mode": "Direct"})
+    run(writer.flush())
+    assert collection.stored == [1, 3]
+    assert list(writer.pending["failing"][1]) == [(("chat_id", 2),)]
+
+
+def test_failing_write_is_dropped(environment, run):
+    from ShrutixMusic.core.writebehind import MAX_ATTEMPTS, WriteBehind
+
+    writer = WriteBehind()
+    collection = FailingCollection(failing={2})
+    writer.upsert(collection, {"chat_id": 2}, {"mode": "Direct"})
+    for _ in range(MAX_ATTEMPTS):
+        run(writer.flush())
+    assert collection.batches == MAX_ATTEMPTS
+    assert not writer.pending
+    assert not writer.attempts
+
+
+def test_failed_batch_backs_off(environment, run):
+    from ShrutixMusic.core.writebehind import WriteBehind
+
+    writer = WriteBehind()
+    collection = FailingCollection(down=True)
+    writer.upsert(collection, {"chat_id": 1}, {"mode": "Direct"})
+    run(writer.flush())
+    run(writer.flush())
+    assert collection.batches == 1
+    collection.down = False
+    run(writer.flush(force=True))
+    assert collection.stored == [1]
+    assert not writer.pending
+    assert not writer.backoff